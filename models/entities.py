@@ -1,11 +1,27 @@
 """Domain models for the Scheduling Agent."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from enum import IntEnum
 from typing import Literal, Optional
+from zoneinfo import ZoneInfo
 
 
-@dataclass
+class CalendarType(IntEnum):
+    """Calendar an event belongs to (Client takes priority over Apexon)."""
+    APEXON = 0
+    CLIENT = 1
+
+
+def char_mask(text: str) -> int:
+    """Bitmask of the characters in text (code points folded into 64 bits)."""
+    mask = 0
+    for ch in text:
+        mask |= 1 << (ord(ch) & 63)
+    return mask
+
+
+@dataclass(slots=True, frozen=True)
 class Candidate:
     """Represents a new hire candidate."""
     id: str
@@ -16,9 +32,17 @@ class Candidate:
     start_date: date
     hiring_manager_id: str
     reporting_manager_id: str
+    tz: ZoneInfo = field(init=False, repr=False, compare=False)  # resolved location_timezone
+    name_lc: str = field(init=False, repr=False, compare=False)  # normalized name for matching
+    name_mask: int = field(init=False, repr=False, compare=False)  # char_mask(name_lc)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "tz", ZoneInfo(self.location_timezone))
+        object.__setattr__(self, "name_lc", self.name.lower().strip())
+        object.__setattr__(self, "name_mask", char_mask(self.name_lc))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Manager:
     """Represents a manager (hiring, reporting, HRBP, etc.)."""
     id: str
@@ -26,44 +50,48 @@ class Manager:
     email: str
     role: Literal["Hiring Manager", "Reporting Manager", "HRBP", "Buddy", "Recruiter"]
     location_timezone: str
-    calendar_ids: dict[str, str]  # {"apexon": "...", "client": "..."}
+    calendar_ids: dict[str, str] = field(hash=False)  # {"apexon": "...", "client": "..."} (not hashed)
+    tz: ZoneInfo = field(init=False, repr=False, compare=False)  # resolved location_timezone
+    
+    def __post_init__(self):
+        object.__setattr__(self, "tz", ZoneInfo(self.location_timezone))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CalendarEvent:
     """Represents a calendar event (busy slot)."""
     id: str
-    calendar_type: Literal["apexon", "client"]
+    calendar_type: CalendarType
     owner_id: str  # manager id
     start: datetime
     end: datetime
     title: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TimeSlot:
     """Represents a time slot (can be free or busy)."""
     start: datetime
     end: datetime
-    participants: list[str]  # list of participant ids
+    participants: tuple[str, ...]  # participant ids
     source: Optional[str] = None  # e.g., "merged_availability"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MeetingRequest:
     """Request to schedule a meeting."""
     candidate_id: str
-    participants: list[str]  # candidate + managers
+    participants: tuple[str, ...]  # candidate + managers
     duration_minutes: int
     deadline_date: date
     meeting_type: Literal["Intro with Hiring Manager", "Intro with Reporting Manager", "Intro with HRBP", "Intro with Buddy"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MeetingProposal:
     """A proposed meeting time slot."""
     time_slot: TimeSlot
     meeting_type: str
     score: float
-    constraints_violated: list[str]
+    constraints_violated: tuple[str, ...]
 
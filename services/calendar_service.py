@@ -1,12 +1,17 @@
 """Calendar service with dual calendar support."""
 
-from datetime import datetime, timedelta, time
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, time, timezone
 from typing import Literal
 
-import pytz
-
-from models.entities import CalendarEvent, Manager, TimeSlot
+from models.entities import CalendarEvent, CalendarType, Manager, TimeSlot
 from services.talent_recruit_client import TalentRecruitClient
+from services.time_utils import day_utc_bounds, from_epoch_us, to_epoch_us
+
+
+# Distinct query windows cached per user before that user's cache is reset
+_MAX_CACHED_WINDOWS = 64
 
 
 class CalendarService:
@@ -16,6 +21,20 @@ class CalendarService:
         """Initialize with employee data client."""
         self.data_client = data_client
         self._calendar_events: dict[str, list[CalendarEvent]] = {}
+        # Per-user events partitioned by calendar type (sorted by start)
+        self._apexon_events: dict[str, list[CalendarEvent]] = {}
+        self._client_events: dict[str, list[CalendarEvent]] = {}
+        # Precomputed per-user busy data (Client-prioritised), rebuilt when dirty.
+        # Times are UTC epoch microseconds so the hot loops compare plain ints.
+        self._busy_events: dict[str, list[CalendarEvent]] = {}
+        self._busy_event_starts_utc: dict[str, list[int]] = {}
+        self._merged_busy: dict[str, list[tuple[int, int]]] = {}
+        self._merged_busy_ends: dict[str, list[int]] = {}
+        # Free slots per (range start, range end, business hours), reset with the busy data
+        self._availability_cache: dict[str, dict[tuple[int, int, int, int], list[TimeSlot]]] = {}
+        # Free intervals per (local day, business hours), so overlapping windows share days
+        self._day_free_cache: dict[str, dict[tuple[date, int, int], list[tuple[int, int]]]] = {}
+        self._dirty: set[str] = set()
         self._initialize_synthetic_events()
     
     def _initialize_synthetic_events(self):
@@ -37,7 +56,7 @@ class CalendarService:
                 continue
             
             events = []
-            tz = pytz.timezone(manager.location_timezone)
+            tz = manager.tz
             
             # Generate events for the next 30 days
             for day_offset in range(30):
@@ -47,15 +66,15 @@ class CalendarService:
                 if current_date.weekday() >= 5:
                     continue
                 
-                # Combine date with time.min to create a datetime, then localize
-                local_date = tz.localize(datetime.combine(current_date, time.min))
+                # Combine date with time.min in the manager's local timezone
+                local_date = datetime.combine(current_date, time.min, tzinfo=tz)
                 
                 # Apexon calendar: regular meetings during business hours
                 if "apexon" in manager.calendar_ids:
                     # Morning standup (9:00-9:30 local)
                     events.append(CalendarEvent(
                         id=f"apexon_{manager.id}_{day_offset}_standup",
-                        calendar_type="apexon",
+                        calendar_type=CalendarType.APEXON,
                         owner_id=manager.id,
                         start=local_date.replace(hour=9, minute=0),
                         end=local_date.replace(hour=9, minute=30),
@@ -66,7 +85,7 @@ class CalendarService:
                     if day_offset % 2 == 0:
                         events.append(CalendarEvent(
                             id=f"apexon_{manager.id}_{day_offset}_meeting",
-                            calendar_type="apexon",
+                            calendar_type=CalendarType.APEXON,
                             owner_id=manager.id,
                             start=local_date.replace(hour=14, minute=0),
                             end=local_date.replace(hour=15, minute=0),
@@ -79,7 +98,7 @@ class CalendarService:
                     if day_offset % 3 == 0:
                         events.append(CalendarEvent(
                             id=f"client_{manager.id}_{day_offset}_sync",
-                            calendar_type="client",
+                            calendar_type=CalendarType.CLIENT,
                             owner_id=manager.id,
                             start=local_date.replace(hour=11, minute=0),
                             end=local_date.replace(hour=12, minute=0),
@@ -90,24 +109,40 @@ class CalendarService:
                     if day_offset % 4 == 1:
                         events.append(CalendarEvent(
                             id=f"client_{manager.id}_{day_offset}_review",
-                            calendar_type="client",
+                            calendar_type=CalendarType.CLIENT,
                             owner_id=manager.id,
                             start=local_date.replace(hour=16, minute=0),
                             end=local_date.replace(hour=17, minute=0),
                             title="Client Review"
                         ))
             
+            # Keep events sorted by start so busy data can be built in one sweep
+            events.sort(key=lambda e: e.start)
             self._calendar_events[manager.id] = events
+            
+            # Partition by calendar type once so lookups don't re-filter
+            apexon_events = []
+            client_events = []
+            for event in events:
+                if event.calendar_type is CalendarType.CLIENT:
+                    client_events.append(event)
+                else:
+                    apexon_events.append(event)
+            self._apexon_events[manager.id] = apexon_events
+            self._client_events[manager.id] = client_events
+            self._dirty.add(manager.id)
+    
+    def get_apexon_calendar_events(self, user_id: str) -> Sequence[CalendarEvent]:
+        """Get Apexon calendar events for a user (a snapshot; the store stays private)."""
+        return tuple(self._apexon_events.get(user_id, ()))
     
-    def get_apexon_calendar_events(self, user_id: str) -> list[CalendarEvent]:
-        """Get Apexon calendar events for a user."""
-        all_events = self._calendar_events.get(user_id, [])
-        return [e for e in all_events if e.calendar_type == "apexon"]
+    def get_client_calendar_events(self, user_id: str) -> Sequence[CalendarEvent]:
+        """Get Client calendar events for a user (a snapshot; the store stays private)."""
+        return tuple(self._client_events.get(user_id, ()))
     
-    def get_client_calendar_events(self, user_id: str) -> list[CalendarEvent]:
-        """Get Client calendar events for a user."""
-        all_events = self._calendar_events.get(user_id, [])
-        return [e for e in all_events if e.calendar_type == "client"]
+    def invalidate(self, user_id: str):
+        """Drop a user's cached busy data and availability (e.g. after a calendar change)."""
+        self._dirty.add(user_id)
     
     def get_merged_availability(
         self, 
@@ -136,40 +171,25 @@ class CalendarService:
         if not manager:
             return []
         
-        tz = pytz.timezone(manager.location_timezone)
+        # Merged busy blocks, sorted by start (client events take priority)
+        self._ensure_busy_cache(user_id)
+        busy_slots = self._merged_busy[user_id]
+        busy_ends = self._merged_busy_ends[user_id]
         
-        # Get all busy events
-        apexon_events = self.get_apexon_calendar_events(user_id)
-        client_events = self.get_client_calendar_events(user_id)
-        
-        # Convert to UTC and merge (client events take priority)
-        busy_slots: list[tuple[datetime, datetime]] = []
-        
-        # Add client events first (higher priority)
-        for event in client_events:
-            busy_slots.append((event.start.astimezone(pytz.UTC), event.end.astimezone(pytz.UTC)))
-        
-        # Add apexon events, but skip if they conflict with client events
-        for event in apexon_events:
-            event_start_utc = event.start.astimezone(pytz.UTC)
-            event_end_utc = event.end.astimezone(pytz.UTC)
-            
-            # Check if this overlaps with any client event
-            conflicts = False
-            for client_start, client_end in busy_slots:
-                if not (event_end_utc <= client_start or event_start_utc >= client_end):
-                    conflicts = True
-                    break
-            
-            if not conflicts:
-                busy_slots.append((event_start_utc, event_end_utc))
+        range_start_utc = to_epoch_us(start_date.replace(tzinfo=timezone.utc))
+        range_end_utc = to_epoch_us(end_date.replace(tzinfo=timezone.utc))
         
-        # Sort busy slots by start time
-        busy_slots.sort(key=lambda x: x[0])
+        # Repeated queries for the same window reuse the computed slots
+        cache_key = (range_start_utc, range_end_utc, business_hours_start, business_hours_end)
+        user_cache = self._availability_cache[user_id]
+        if cache_key in user_cache:
+            return list(user_cache[cache_key])
+        if len(user_cache) >= _MAX_CACHED_WINDOWS:
+            user_cache.clear()
         
         # Generate free slots
         free_slots = []
-        current = start_date.replace(tzinfo=pytz.UTC)
+        day_cache = self._day_free_cache[user_id]
         
         # Iterate through each day in the range
         current_date = start_date.date()
@@ -178,69 +198,126 @@ class CalendarService:
         while current_date <= end_date_only:
             # Skip weekends
             if current_date.weekday() < 5:
-                # Get business hours for this day in local timezone
-                local_start = tz.localize(
-                    datetime.combine(current_date, time(business_hours_start, 0))
-                )
-                local_end = tz.localize(
-                    datetime.combine(current_date, time(business_hours_end, 0))
-                )
-                
-                day_start_utc = local_start.astimezone(pytz.UTC)
-                day_end_utc = local_end.astimezone(pytz.UTC)
-                
-                # Clamp to requested range
-                slot_start = max(day_start_utc, start_date.replace(tzinfo=pytz.UTC))
-                slot_end = min(day_end_utc, end_date.replace(tzinfo=pytz.UTC))
+                day_key = (current_date, business_hours_start, business_hours_end)
+                day_free = day_cache.get(day_key)
+                if day_free is None:
+                    day_free = self._free_intervals_for_day(
+                        busy_slots,
+                        busy_ends,
+                        *day_utc_bounds(
+                            manager.tz,
+                            current_date,
+                            business_hours_start,
+                            business_hours_end
+                        )
+                    )
+                    day_cache[day_key] = day_free
                 
-                if slot_start < slot_end:
-                    # Find gaps between busy slots within this day
-                    day_busy = [
-                        (max(bs[0], slot_start), min(bs[1], slot_end))
-                        for bs in busy_slots
-                        if bs[0] < slot_end and bs[1] > slot_start
-                    ]
-                    
-                    if not day_busy:
-                        # Entire day is free
+                for free_start, free_end in day_free:
+                    # Clamp to requested range
+                    slot_start = max(free_start, range_start_utc)
+                    slot_end = min(free_end, range_end_utc)
+                    if slot_start < slot_end:
                         free_slots.append(TimeSlot(
-                            start=slot_start,
-                            end=slot_end,
-                            participants=[user_id],
+                            start=from_epoch_us(slot_start),
+                            end=from_epoch_us(slot_end),
+                            participants=(user_id,),
                             source="merged_availability"
                         ))
-                    else:
-                        # Find gaps
-                        if day_busy[0][0] > slot_start:
-                            free_slots.append(TimeSlot(
-                                start=slot_start,
-                                end=day_busy[0][0],
-                                participants=[user_id],
-                                source="merged_availability"
-                            ))
-                        
-                        for i in range(len(day_busy) - 1):
-                            gap_start = day_busy[i][1]
-                            gap_end = day_busy[i + 1][0]
-                            if gap_start < gap_end:
-                                free_slots.append(TimeSlot(
-                                    start=gap_start,
-                                    end=gap_end,
-                                    participants=[user_id],
-                                    source="merged_availability"
-                                ))
-                        
-                        if day_busy[-1][1] < slot_end:
-                            free_slots.append(TimeSlot(
-                                start=day_busy[-1][1],
-                                end=slot_end,
-                                participants=[user_id],
-                                source="merged_availability"
-                            ))
             
             current_date += timedelta(days=1)
         
-        return free_slots
+        user_cache[cache_key] = free_slots
+        return list(free_slots)
+    
+    @staticmethod
+    def _free_intervals_for_day(
+        busy_slots: list[tuple[int, int]],
+        busy_ends: list[int],
+        day_start: int,
+        day_end: int
+    ) -> list[tuple[int, int]]:
+        """Subtract merged busy blocks from one day's business-hours window."""
+        free: list[tuple[int, int]] = []
+        if day_start >= day_end:
+            return free
+        
+        # First busy block ending after the window starts (merged blocks
+        # don't overlap, so their ends are sorted too)
+        idx = bisect_right(busy_ends, day_start)
+        
+        cursor = day_start
+        while idx < len(busy_slots) and busy_slots[idx][0] < day_end:
+            busy_start, busy_end = busy_slots[idx]
+            if cursor < busy_start:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            idx += 1
+        
+        if cursor < day_end:
+            free.append((cursor, day_end))
+        return free
+    
+    @staticmethod
+    def _union_intervals(
+        intervals: list[tuple[int, int]]
+    ) -> list[tuple[int, int]]:
+        """Merge intervals into a sorted list of non-overlapping intervals."""
+        merged: list[tuple[int, int]] = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                # Overlaps (or touches) the current block - extend it
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+    
+    def _build_busy_cache(self, user_id: str):
+        """
+        Precompute a user's busy events and merged busy blocks.
+        
+        Client events are always busy. Apexon events that overlap any Client
+        event are dropped (Client calendar takes priority).
+        """
+        client_events = self._client_events.get(user_id, [])
+        client_blocks = self._union_intervals([
+            (to_epoch_us(e.start), to_epoch_us(e.end)) for e in client_events
+        ])
+        
+        # Sweep the start-sorted Apexon events against the sorted Client blocks
+        busy_events = list(client_events)
+        block_idx = 0
+        for event in self._apexon_events.get(user_id, []):
+            start = to_epoch_us(event.start)
+            end = to_epoch_us(event.end)
+            
+            # Skip Client blocks that end before this event starts
+            while block_idx < len(client_blocks) and client_blocks[block_idx][1] <= start:
+                block_idx += 1
+            
+            if block_idx < len(client_blocks) and client_blocks[block_idx][0] < end:
+                continue  # Conflicts with a Client event
+            
+            busy_events.append(event)
+        
+        busy_events.sort(key=lambda e: e.start)
+        busy_intervals = [
+            (to_epoch_us(e.start), to_epoch_us(e.end)) for e in busy_events
+        ]
+        
+        self._busy_events[user_id] = busy_events
+        self._busy_event_starts_utc[user_id] = [start for start, _ in busy_intervals]
+        self._merged_busy[user_id] = self._union_intervals(busy_intervals)
+        self._merged_busy_ends[user_id] = [end for _, end in self._merged_busy[user_id]]
+        self._availability_cache[user_id] = {}
+        self._day_free_cache[user_id] = {}
+        self._dirty.discard(user_id)
+    
+    def _ensure_busy_cache(self, user_id: str):
+        """Build a user's busy data if it is missing or stale."""
+        if user_id in self._dirty or user_id not in self._merged_busy:
+            self._build_busy_cache(user_id)
     
     def get_busy_slots(
         self,
@@ -253,36 +330,13 @@ class CalendarService:
         if not manager:
             return []
         
-        apexon_events = self.get_apexon_calendar_events(user_id)
-        client_events = self.get_client_calendar_events(user_id)
-        
-        all_events = []
-        start_utc = start_date.replace(tzinfo=pytz.UTC) if start_date.tzinfo is None else start_date
-        end_utc = end_date.replace(tzinfo=pytz.UTC) if end_date.tzinfo is None else end_date
+        start_utc = to_epoch_us(start_date.replace(tzinfo=timezone.utc) if start_date.tzinfo is None else start_date)
+        end_utc = to_epoch_us(end_date.replace(tzinfo=timezone.utc) if end_date.tzinfo is None else end_date)
         
-        # Add client events (higher priority)
-        for event in client_events:
-            event_start_utc = event.start.astimezone(pytz.UTC)
-            if start_utc <= event_start_utc < end_utc:
-                all_events.append(event)
+        self._ensure_busy_cache(user_id)
         
-        # Add apexon events that don't conflict with client
-        for event in apexon_events:
-            event_start_utc = event.start.astimezone(pytz.UTC)
-            event_end_utc = event.end.astimezone(pytz.UTC)
-            
-            if start_utc <= event_start_utc < end_utc:
-                # Check for conflicts with client events
-                conflicts = False
-                for client_event in client_events:
-                    client_start = client_event.start.astimezone(pytz.UTC)
-                    client_end = client_event.end.astimezone(pytz.UTC)
-                    if not (event_end_utc <= client_start or event_start_utc >= client_end):
-                        conflicts = True
-                        break
-                
-                if not conflicts:
-                    all_events.append(event)
-        
-        return sorted(all_events, key=lambda e: e.start)
-
+        # Slice the busy events starting within [start_utc, end_utc)
+        starts = self._busy_event_starts_utc[user_id]
+        lo = bisect_left(starts, start_utc)
+        hi = bisect_left(starts, end_utc)
+        return self._busy_events[user_id][lo:hi]
@@ -4,8 +4,34 @@ import os
 import base64
 import json
 from datetime import datetime
+from importlib.util import find_spec
 from typing import Optional, Dict, Any, List
 import httpx
+import orjson
+
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Field name variations for manager info, in priority order.
+# Primary format uses underscores (as shown in example); spaces/camelCase are fallbacks.
+_HRBP_EMPLOYEE_ID_KEYS = ("hrbp_employee_id", "hrbp employee id", "hrbpEmployeeId")
+_HRBP_EMAIL_KEYS = ("hrbp_email_id", "hrbp email id", "hrbpEmailId", "hrbpEmail")
+_DIRECT_MANAGER_EMPLOYEE_ID_KEYS = (
+    "direct_manager_employee_id", "direct manager employee id", "directManagerEmployeeId"
+)
+_DIRECT_MANAGER_EMAIL_KEYS = (
+    "direct_manager_email", "direct manager email", "directManagerEmail"
+)
+
+
+def _get_value(data: Dict[str, Any], keys: tuple) -> str:
+    """Get the first non-empty value among alias keys (stripped string, "" if none)."""
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return str(value).strip()
+    return ""
 
 
 class DarwinboxClient:
@@ -44,18 +70,117 @@ class DarwinboxClient:
             "https://apexon-peoplehubuat.darwinbox.in/masterapi/employee"
         )
         
-        # Cache for employee data
-        self._employee_cache: Dict[str, Dict[str, Any]] = {}
-    
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests with Basic Auth."""
+        # Request headers with Basic Auth, built once (credentials don't change)
         credentials = f"{self.username}:{self.password}"
         encoded_credentials = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
-        
-        return {
+        self._headers = {
             "Content-Type": "application/json",
             "Authorization": f"Basic {encoded_credentials}"
         }
+        
+        # Long-lived client so connections (and TLS sessions) are reused across calls
+        self._client = httpx.Client(
+            http2=_HTTP2_AVAILABLE,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=10)
+        )
+        
+        # Cache for employee data, plus lowercased email -> employee_id index
+        self._employee_cache: Dict[str, Dict[str, Any]] = {}
+        self._email_index: Dict[str, str] = {}
+        
+        # HTTP method the API is known to accept (None until a GET has been tried)
+        self._preferred_method: Optional[str] = None
+    
+    def close(self):
+        """Close the underlying HTTP client and its pooled connections."""
+        self._client.close()
+    
+    def __enter__(self) -> "DarwinboxClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @staticmethod
+    def _extract_id(employee: Dict[str, Any]) -> str:
+        """Get an employee's ID as a string ("" if missing)."""
+        # Try multiple employee_id field variations
+        emp_id = employee.get("employee_id") or employee.get("employeeId")
+        return str(emp_id) if emp_id else ""
+    
+    @staticmethod
+    def _employee_email(employee: Dict[str, Any]) -> str:
+        """Get an employee's email, trying multiple field name variations."""
+        return (
+            employee.get("email", "") or
+            employee.get("email_id", "") or
+            employee.get("emailId", "") or
+            employee.get("employee_email", "")
+        )
+    
+    def _cache_employee(self, employee: Dict[str, Any]):
+        """Store an employee in the cache and index it by email."""
+        emp_id = self._extract_id(employee)
+        if not emp_id:
+            return
+        
+        # Drop the email the previous record was indexed under (it may have changed)
+        previous = self._employee_cache.get(emp_id)
+        if previous is not None:
+            previous_email = self._employee_email(previous).lower()
+            if self._email_index.get(previous_email) == emp_id:
+                del self._email_index[previous_email]
+        
+        self._employee_cache[emp_id] = employee
+        
+        emp_email = self._employee_email(employee)
+        if emp_email:
+            self._email_index[emp_email.lower()] = emp_id
+    
+    def _get_headers(self) -> Dict[str, str]:
+        """Get headers for API requests with Basic Auth."""
+        return self._headers
+    
+    def _send(self, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        Send an API request, skipping the GET probe once POST is known to be required.
+        
+        Args:
+            payload: Request body
+            
+        Returns:
+            The HTTP response (status not yet checked)
+        """
+        # Encode the body once; GET and the POST fallback send the same bytes
+        body = orjson.dumps(payload)
+        
+        if self._preferred_method != "POST":
+            # Try GET method first (as shown in Postman screenshots)
+            # Some APIs accept GET with JSON body
+            try:
+                response = self._client.request(
+                    "GET",
+                    self.base_url,
+                    content=body,
+                    headers=self._get_headers()
+                )
+                # If GET returns 405 or similar, try POST
+                if response.status_code in [405, 400]:
+                    self._preferred_method = "POST"
+                    raise httpx.HTTPStatusError("Method not allowed", request=response.request, response=response)
+                if response.is_success:
+                    self._preferred_method = "GET"
+                return response
+            except (httpx.HTTPStatusError, httpx.RequestError):
+                pass
+        
+        # Fallback to POST if GET doesn't work
+        return self._client.post(
+            self.base_url,
+            content=body,
+            headers=self._get_headers()
+        )
     
     def get_all_employees(self, last_modified: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -79,51 +204,28 @@ class DarwinboxClient:
         }
         
         try:
-            with httpx.Client(timeout=30.0) as client:
-                # Try GET method first
-                try:
-                    response = client.request(
-                        "GET",
-                        self.base_url,
-                        content=json.dumps(payload),
-                        headers=self._get_headers()
-                    )
-                    if response.status_code in [405, 400]:
-                        raise httpx.HTTPStatusError("Method not allowed", request=response.request, response=response)
-                except (httpx.HTTPStatusError, httpx.RequestError):
-                    # Fallback to POST
-                    response = client.post(
-                        self.base_url,
-                        json=payload,
-                        headers=self._get_headers()
-                    )
-                response.raise_for_status()
+            response = self._send(payload)
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            
+            if result.get("status") == 1:
+                employee_data = result.get("employee_data", [])
                 
-                result = response.json()
+                # Cache all results
+                for employee in employee_data:
+                    self._cache_employee(employee)
+                
+                return employee_data
+            else:
+                error_msg = result.get("message", "Unknown error")
+                print(f"Darwinbox API error: {error_msg}")
+                return []
                 
-                if result.get("status") == 1:
-                    employee_data = result.get("employee_data", [])
-                    
-                    # Cache all results
-                    for employee in employee_data:
-                        emp_id = (
-                            employee.get("employee_id", "") or
-                            employee.get("employeeId", "") or
-                            str(employee.get("employee_id", ""))
-                        )
-                        if emp_id:
-                            self._employee_cache[str(emp_id)] = employee
-                    
-                    return employee_data
-                else:
-                    error_msg = result.get("message", "Unknown error")
-                    print(f"Darwinbox API error: {error_msg}")
-                    return []
-                    
         except httpx.HTTPError as e:
             print(f"HTTP error fetching all employees from Darwinbox: {e}")
             return []
-        except json.JSONDecodeError:
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
             print("JSON decode error in Darwinbox API response")
             return []
         except Exception as e:
@@ -173,63 +275,54 @@ class DarwinboxClient:
         }
         
         try:
-            with httpx.Client(timeout=30.0) as client:
-                # Try GET method first (as shown in Postman screenshots)
-                # Some APIs accept GET with JSON body
-                try:
-                    response = client.request(
-                        "GET",
-                        self.base_url,
-                        content=json.dumps(payload),
-                        headers=self._get_headers()
-                    )
-                    # If GET returns 405 or similar, try POST
-                    if response.status_code in [405, 400]:
-                        raise httpx.HTTPStatusError("Method not allowed", request=response.request, response=response)
-                except (httpx.HTTPStatusError, httpx.RequestError):
-                    # Fallback to POST if GET doesn't work
-                    response = client.post(
-                        self.base_url,
-                        json=payload,
-                        headers=self._get_headers()
-                    )
-                response.raise_for_status()
+            response = self._send(payload)
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            
+            # Check if request was successful
+            if result.get("status") == 1:
+                employee_data = result.get("employee_data", [])
                 
-                result = response.json()
+                # Cache the results
+                for employee in employee_data:
+                    self._cache_employee(employee)
+                
+                # Return cached + new results
+                return cached_results + employee_data
+            else:
+                # API returned error
+                error_msg = result.get("message", "Unknown error")
+                print(f"Darwinbox API error: {error_msg}")
+                return cached_results
                 
-                # Check if request was successful
-                if result.get("status") == 1:
-                    employee_data = result.get("employee_data", [])
-                    
-                    # Cache the results
-                    for employee in employee_data:
-                        # Try multiple employee_id field variations
-                        emp_id = (
-                            employee.get("employee_id", "") or
-                            employee.get("employeeId", "") or
-                            str(employee.get("employee_id", ""))
-                        )
-                        if emp_id:
-                            self._employee_cache[str(emp_id)] = employee
-                    
-                    # Return cached + new results
-                    return cached_results + employee_data
-                else:
-                    # API returned error
-                    error_msg = result.get("message", "Unknown error")
-                    print(f"Darwinbox API error: {error_msg}")
-                    return cached_results
-                    
         except httpx.HTTPError as e:
             print(f"HTTP error fetching employee data from Darwinbox: {e}")
             return cached_results
-        except json.JSONDecodeError:
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
             print("JSON decode error in Darwinbox API response")
             return cached_results
         except Exception as e:
             print(f"Error fetching employee data from Darwinbox: {e}")
             return cached_results
     
+    def prefetch(self, employee_ids: List[str]):
+        """
+        Warm the cache for several employees with a single API round-trip.
+
+        Call this before looking up many employees with get_employee_by_id so
+        each lookup is served from the cache.
+
+        Args:
+            employee_ids: Employee IDs to fetch (already-cached IDs are skipped)
+        """
+        uncached_ids = list(dict.fromkeys(
+            str(emp_id).strip() for emp_id in employee_ids
+            if str(emp_id).strip() not in self._employee_cache
+        ))
+        if uncached_ids:
+            self.get_employee_data(uncached_ids)
+
     def get_employee_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """
         Get employee data by email address.
@@ -244,16 +337,9 @@ class DarwinboxClient:
             Employee data dictionary or None if not found
         """
         # Check cache first
-        for emp_data in self._employee_cache.values():
-            # Try multiple email field variations
-            emp_email = (
-                emp_data.get("email", "") or 
-                emp_data.get("email_id", "") or
-                emp_data.get("emailId", "") or
-                emp_data.get("employee_email", "")
-            )
-            if emp_email and emp_email.lower() == email.lower():
-                return emp_data
+        emp_id = self._email_index.get(email.lower())
+        if emp_id:
+            return self._employee_cache.get(emp_id)
         
         # If not in cache, we'd need to fetch all employees
         # For now, return None - this should be called with employee_id when possible
@@ -272,15 +358,10 @@ class DarwinboxClient:
         # Normalize employee_id to string
         employee_id_str = str(employee_id).strip()
         
-        # Check cache first
+        # Check cache first (keys are always stored as str(emp_id))
         if employee_id_str in self._employee_cache:
             return self._employee_cache[employee_id_str]
         
-        # Also check cache with different formats
-        for cached_id, cached_data in self._employee_cache.items():
-            if str(cached_id) == employee_id_str or cached_id == employee_id_str:
-                return cached_data
-        
         # Fetch from API
         results = self.get_employee_data([employee_id_str])
         if results:
@@ -305,32 +386,9 @@ class DarwinboxClient:
             "reporting_manager": None
         }
         
-        # Helper function to get value with multiple possible keys
-        def get_value(data: Dict[str, Any], *keys: str, default: str = "") -> str:
-            """Try multiple keys to get a value."""
-            for key in keys:
-                value = data.get(key, "")
-                if value:
-                    return str(value).strip()
-            return default
-        
         # Extract HRBP info - try multiple field name variations
-        # Primary format uses underscores (as shown in example)
-        hrbp_employee_id = get_value(
-            employee_data,
-            "hrbp_employee_id",  # Primary - underscore format
-            "hrbp employee id",  # Fallback - spaces
-            "hrbpEmployeeId",
-            default=""
-        )
-        hrbp_email = get_value(
-            employee_data,
-            "hrbp_email_id",  # Primary - underscore format
-            "hrbp email id",  # Fallback - spaces
-            "hrbpEmailId",
-            "hrbpEmail",
-            default=""
-        )
+        hrbp_employee_id = _get_value(employee_data, _HRBP_EMPLOYEE_ID_KEYS)
+        hrbp_email = _get_value(employee_data, _HRBP_EMAIL_KEYS)
         
         if hrbp_email or hrbp_employee_id:
             result["hrbp"] = {
@@ -339,21 +397,8 @@ class DarwinboxClient:
             }
         
         # Extract direct manager info (could be hiring or reporting manager)
-        # Primary format uses underscores (as shown in example)
-        direct_manager_employee_id = get_value(
-            employee_data,
-            "direct_manager_employee_id",  # Primary - underscore format
-            "direct manager employee id",  # Fallback - spaces
-            "directManagerEmployeeId",
-            default=""
-        )
-        direct_manager_email = get_value(
-            employee_data,
-            "direct_manager_email",  # Primary - underscore format
-            "direct manager email",  # Fallback - spaces
-            "directManagerEmail",
-            default=""
-        )
+        direct_manager_employee_id = _get_value(employee_data, _DIRECT_MANAGER_EMPLOYEE_ID_KEYS)
+        direct_manager_email = _get_value(employee_data, _DIRECT_MANAGER_EMAIL_KEYS)
         
         if direct_manager_email or direct_manager_employee_id:
             # Use direct manager as both hiring and reporting manager for now
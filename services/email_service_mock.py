@@ -1,14 +1,50 @@
 """Mock email service for sending meeting invites."""
 
-from datetime import datetime
+from collections.abc import Sequence
+from datetime import datetime, timezone
 from typing import Optional
 
-import pytz
-
 from models.entities import MeetingProposal, TimeSlot
 from services.talent_recruit_client import TalentRecruitClient
 
 
+_INVITE_TIME_FMT = '%A, %B %d, %Y at %I:%M %p %Z'
+
+# Static closing text of the invite body
+_INVITE_TRAILER = """Please let me know if this time works for you. If you need to reschedule or have any questions, just reply to this email and I'll be happy to find an alternative time that works better.
+
+I'll send out a calendar invite once we confirm. Looking forward to getting this scheduled!
+
+Best regards,
+Talent Acquisition Team
+Apexon
+
+---
+Note: This meeting proposal was generated automatically. Please confirm your availability or suggest an alternative time if needed."""
+
+_MEETING_PURPOSE_MAP = {
+    "Intro with Hiring Manager": "introduction with their Hiring Manager",
+    "Intro with Reporting Manager": "introduction with their Reporting Manager",
+    "Intro with HRBP": "introduction with their HR Business Partner",
+    "Intro with Buddy": "introduction with their Buddy"
+}
+
+
+class _ReadOnlyListView(Sequence):
+    """Read-only, zero-copy view over a list."""
+    
+    __slots__ = ("_items",)
+    
+    def __init__(self, items: list):
+        self._items = items
+    
+    def __getitem__(self, index):
+        return self._items[index]
+    
+    def __len__(self) -> int:
+        return len(self._items)
+
+
 class EmailServiceMock:
     """Mock email service that logs emails instead of sending them."""
     
@@ -21,7 +57,7 @@ class EmailServiceMock:
         self,
         proposal: MeetingProposal,
         candidate_id: str,
-        participant_ids: list[str]
+        participant_ids: Sequence[str]
     ) -> dict:
         """
         Send meeting invite email (mock).
@@ -33,32 +69,42 @@ class EmailServiceMock:
         if not candidate:
             return {}
         
-        # Get participant emails and names
+        # Resolve every participant once: emails plus the details the body needs
         to_emails = []
-        participant_names = []
+        participants_info: dict[str, dict] = {}
         
         for pid in participant_ids:
             if pid == candidate_id:
                 to_emails.append(candidate.email)
-                participant_names.append(candidate.name)
+                participants_info[pid] = {
+                    "name": candidate.name,
+                    "email": candidate.email,
+                    "role": candidate.role_title,
+                    "tz": candidate.tz
+                }
             else:
                 manager = self.data_client.get_manager_by_id(pid)
                 if manager:
                     to_emails.append(manager.email)
-                    participant_names.append(manager.name)
+                    participants_info[pid] = {
+                        "name": manager.name,
+                        "email": manager.email,
+                        "role": manager.role,
+                        "tz": manager.tz
+                    }
         
         # Generate email content
         subject, body = self._generate_invite_content(
             proposal,
             candidate,
-            participant_names
+            participants_info
         )
         
         email_record = {
             "to": to_emails,
             "subject": subject,
             "body": body,
-            "sent_at": datetime.utcnow(),
+            "sent_at": datetime.now(timezone.utc),
             "meeting_type": proposal.meeting_type,
             "proposed_time_utc": proposal.time_slot.start.isoformat()
         }
@@ -70,107 +116,88 @@ class EmailServiceMock:
         self,
         proposal: MeetingProposal,
         candidate,
-        participant_names: list[str]
+        participants_info: dict[str, dict]
     ) -> tuple[str, str]:
-        """Generate email subject and body."""
+        """
+        Generate email subject and body.
+        
+        Args:
+            participants_info: Participant id -> {"name", "email", "role", "tz"},
+                as resolved by send_meeting_invite
+        """
         slot = proposal.time_slot
+        slot_start = slot.start
         
-        # Format time in each participant's timezone
-        time_info = []
-        candidate_tz = pytz.timezone(candidate.location_timezone)
-        candidate_local = slot.start.astimezone(candidate_tz)
-        candidate_time_str = candidate_local.strftime('%A, %B %d, %Y at %I:%M %p %Z')
-        time_info.append(
-            f"{candidate.name}: {candidate_time_str}"
-        )
+        # Single pass over the other participants: their local meeting time
+        # (formatted once per distinct timezone) and their attendee line
+        candidate_tz = candidate.tz
+        candidate_local = slot_start.astimezone(candidate_tz)
+        candidate_time_str = candidate_local.strftime(_INVITE_TIME_FMT)
+        time_str_by_tz = {candidate_tz: candidate_time_str}
+        attendee_lines = [f"• {candidate.name} ({candidate.email}) - {candidate.role_title}"]
         
         manager_name = None
         manager_time_str = None
-        for pid, name in zip(proposal.time_slot.participants, participant_names):
+        for pid, info in participants_info.items():
             if pid == candidate.id:
                 continue
-            manager = self.data_client.get_manager_by_id(pid)
-            if manager:
-                manager_name = name
-                manager_tz = pytz.timezone(manager.location_timezone)
-                manager_local = slot.start.astimezone(manager_tz)
-                manager_time_str = manager_local.strftime('%A, %B %d, %Y at %I:%M %p %Z')
-                time_info.append(
-                    f"{name}: {manager_time_str}"
-                )
-        
-        duration_minutes = int((slot.end - slot.start).total_seconds() / 60)
+            manager_name = info["name"]
+            # ZoneInfo instances are cached per name, so a shared timezone shares a key
+            manager_time_str = time_str_by_tz.get(info["tz"])
+            if manager_time_str is None:
+                manager_local = slot_start.astimezone(info["tz"])
+                manager_time_str = manager_local.strftime(_INVITE_TIME_FMT)
+                time_str_by_tz[info["tz"]] = manager_time_str
+            attendee_lines.append(f"• {manager_name} ({info['email']}) - {info['role']}")
+        
+        duration_minutes = int((slot.end - slot_start).total_seconds() / 60)
         
         # Determine meeting purpose based on type
-        meeting_purpose_map = {
-            "Intro with Hiring Manager": "introduction with their Hiring Manager",
-            "Intro with Reporting Manager": "introduction with their Reporting Manager",
-            "Intro with HRBP": "introduction with their HR Business Partner",
-            "Intro with Buddy": "introduction with their Buddy"
-        }
-        meeting_purpose = meeting_purpose_map.get(proposal.meeting_type, "introduction meeting")
+        meeting_purpose = _MEETING_PURPOSE_MAP.get(proposal.meeting_type, "introduction meeting")
         
         subject = f"Introduction Meeting: {candidate.name} - {proposal.meeting_type}"
         
-        # Build a more natural email body
+        # Build a more natural email body from fragments, joined once
         # Greeting
         if manager_name:
-            body = f"""Hi {candidate.name} and {manager_name},"""
+            greeting = f"Hi {candidate.name} and {manager_name},"
         else:
-            body = f"""Hi {candidate.name},"""
-        
-        body += f"""
-
-I hope you're doing well! I'm reaching out to coordinate an {meeting_purpose} for {candidate.name}, who will be joining our team as a {candidate.role_title}.
-
-This is an important part of {candidate.name}'s onboarding process, and I've found a time that should work well for everyone's schedule. Here are the details:
-
-📅 **Proposed Meeting Time:**
-"""
+            greeting = f"Hi {candidate.name},"
         
         if manager_name and manager_time_str and candidate_time_str != manager_time_str:
-            body += f"""• {candidate.name}: {candidate_time_str}
-• {manager_name}: {manager_time_str}
-"""
+            time_lines = [
+                f"• {candidate.name}: {candidate_time_str}",
+                f"• {manager_name}: {manager_time_str}"
+            ]
         else:
-            body += f"""• {candidate_time_str}
-"""
-        
-        body += f"""• Duration: {duration_minutes} minutes
-
-**Who's attending:**
-• {candidate.name} ({candidate.email}) - {candidate.role_title}
-"""
-        
-        for pid, name in zip(proposal.time_slot.participants, participant_names):
-            if pid != candidate.id:
-                manager = self.data_client.get_manager_by_id(pid)
-                if manager:
-                    body += f"""• {name} ({manager.email}) - {manager.role}
-"""
-        
-        body += f"""
-This meeting will be a great opportunity for {candidate.name} to connect with the team and get a better understanding of their role and responsibilities. 
-
-Please let me know if this time works for you. If you need to reschedule or have any questions, just reply to this email and I'll be happy to find an alternative time that works better.
-
-I'll send out a calendar invite once we confirm. Looking forward to getting this scheduled!
-
-Best regards,
-Talent Acquisition Team
-Apexon
-
----
-Note: This meeting proposal was generated automatically. Please confirm your availability or suggest an alternative time if needed.
-        """.strip()
+            time_lines = [f"• {candidate_time_str}"]
+        
+        parts = [
+            greeting,
+            "",
+            f"I hope you're doing well! I'm reaching out to coordinate an {meeting_purpose} for {candidate.name}, who will be joining our team as a {candidate.role_title}.",
+            "",
+            f"This is an important part of {candidate.name}'s onboarding process, and I've found a time that should work well for everyone's schedule. Here are the details:",
+            "",
+            "📅 **Proposed Meeting Time:**",
+            *time_lines,
+            f"• Duration: {duration_minutes} minutes",
+            "",
+            "**Who's attending:**",
+            "\n".join(attendee_lines),
+            f"This meeting will be a great opportunity for {candidate.name} to connect with the team and get a better understanding of their role and responsibilities. ",
+            "",
+            _INVITE_TRAILER
+        ]
+        body = "\n".join(parts)
         
         return subject, body
     
-    def get_sent_emails(self) -> list[dict]:
-        """Get all sent emails."""
-        return self.sent_emails.copy()
+    def get_sent_emails(self) -> Sequence[dict]:
+        """Get all sent emails (read-only view, not a copy)."""
+        return _ReadOnlyListView(self.sent_emails)
     
     def clear_emails(self):
         """Clear email log (for testing/reset)."""
-        self.sent_emails = []
+        self.sent_emails.clear()
 
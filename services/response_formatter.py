@@ -1,11 +1,27 @@
 """Structured response formatter for consistent chatbot responses."""
 
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from datetime import datetime
-import pytz
 
 from models.entities import Candidate, Manager, MeetingProposal
 
+if TYPE_CHECKING:
+    from services.talent_recruit_client import TalentRecruitClient
+
+
+# English day/month names for proposal rendering (what strftime gives in the C locale)
+_DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTH_NAMES = (
+    '', 'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+
+_PERSONA_LABELS = {
+    "hiring_manager": "Hiring Manager",
+    "reporting_manager": "Reporting Manager",
+    "hrbp": "HRBP"
+}
+
 
 class ResponseFormatter:
     """Formats chatbot responses in a consistent, structured manner."""
@@ -33,7 +49,8 @@ class ResponseFormatter:
     def format_candidate_list(
         candidates: List[Candidate], 
         limit: int = 50, 
-        data_client=None,
+        *,
+        data_client: "TalentRecruitClient",
         total_count: Optional[int] = None,
         current_offset: int = 0
     ) -> str:
@@ -66,38 +83,27 @@ class ResponseFormatter:
             ""
         ])
         
-        # Import here to avoid circular dependency
-        if data_client is None:
-            from services.talent_recruit_client import TalentRecruitClient
-            data_client = TalentRecruitClient()
+        # Fetch manager info for every listed candidate up front
+        personas_by_id = data_client.get_related_personas_bulk(
+            [candidate.id for candidate in candidates[:display_count]]
+        )
         
         for i, candidate in enumerate(candidates[:display_count], 1):
-            lines.append(f"{i}. **{candidate.name}** (Employee ID: {candidate.id})")
-            
             # Get manager info for this candidate
-            personas = data_client.get_related_personas_for_candidate(candidate.id)
-            
-            # Show HRBP if available
-            if "hrbp" in personas:
-                hrbp = personas["hrbp"]
-                lines.append(f"   • HRBP: {hrbp.name} ({hrbp.email})")
-            
-            # Show Hiring Manager if available
-            if "hiring_manager" in personas:
-                hm = personas["hiring_manager"]
-                lines.append(f"   • Hiring Manager: {hm.name} ({hm.email})")
-            
-            # Show Reporting Manager if available and different from Hiring Manager
-            if "reporting_manager" in personas:
-                rm = personas["reporting_manager"]
-                # Only show if different from hiring manager
-                if "hiring_manager" not in personas or rm.email != personas["hiring_manager"].email:
-                    lines.append(f"   • Reporting Manager: {rm.name} ({rm.email})")
-            
-            # If no manager info available
-            if not personas:
-                lines.append(f"   • Manager Info: Not available")
+            personas = personas_by_id.get(candidate.id, {})
+            hrbp = personas.get("hrbp")
+            hm = personas.get("hiring_manager")
+            rm = personas.get("reporting_manager")
             
+            # Reporting Manager is only shown if different from Hiring Manager
+            block = (
+                f"{i}. **{candidate.name}** (Employee ID: {candidate.id})",
+                f"   • HRBP: {hrbp.name} ({hrbp.email})" if hrbp else None,
+                f"   • Hiring Manager: {hm.name} ({hm.email})" if hm else None,
+                f"   • Reporting Manager: {rm.name} ({rm.email})" if rm and (not hm or rm.email != hm.email) else None,
+                "   • Manager Info: Not available" if not personas else None
+            )
+            lines.append("\n".join(line for line in block if line))
             lines.append("")
         
         # Show pagination message
@@ -161,7 +167,12 @@ class ResponseFormatter:
         return "\n".join(lines)
     
     @staticmethod
-    def format_personas_list(candidates: List[Candidate], persona_type: str = "hiring_manager") -> str:
+    def format_personas_list(
+        candidates: List[Candidate],
+        persona_type: str = "hiring_manager",
+        *,
+        data_client: "TalentRecruitClient"
+    ) -> str:
         """Format a list showing candidates with/without specific persona."""
         if not candidates:
             return ResponseFormatter.format_error(
@@ -169,57 +180,59 @@ class ResponseFormatter:
                 "No candidates are currently available."
             )
         
-        candidates_with = []
-        candidates_without = []
+        personas_by_id = data_client.get_related_personas_bulk([candidate.id for candidate in candidates])
+        
+        # Determine persona label
+        persona_label = _PERSONA_LABELS.get(persona_type, persona_type.title())
+        
+        # Render both sections in a single pass over the candidates
+        with_lines = []
+        without_lines = []
+        with_count = 0
+        without_count = 0
         
         for candidate in candidates:
-            from services.talent_recruit_client import TalentRecruitClient
-            data_client = TalentRecruitClient()
-            personas = data_client.get_related_personas_for_candidate(candidate.id)
+            manager = personas_by_id.get(candidate.id, {}).get(persona_type)
             
-            if persona_type in personas:
-                candidates_with.append((candidate, personas[persona_type]))
+            if manager is not None:
+                with_count += 1
+                section, index = with_lines, with_count
             else:
-                candidates_without.append(candidate)
-        
-        # Determine persona label
-        persona_labels = {
-            "hiring_manager": "Hiring Manager",
-            "reporting_manager": "Reporting Manager",
-            "hrbp": "HRBP"
-        }
-        persona_label = persona_labels.get(persona_type, persona_type.title())
+                without_count += 1
+                section, index = without_lines, without_count
+            
+            section.append(f"{index}. **{candidate.name}**")
+            # Only show role if it's not the default "Employee"
+            if candidate.role_title and candidate.role_title != "Employee":
+                section.append(f"   • Role: {candidate.role_title}")
+            if manager is not None:
+                section.append(f"   • {persona_label}: {manager.name} ({manager.email})")
+            section.append("")
+        
+        # candidates is non-empty here (checked above)
+        total = len(candidates)
+        with_pct = with_count * 100 // total
+        without_pct = without_count * 100 // total
         
         lines = [
             f"**📋 {persona_label} Information Availability**",
             "",
             "**Summary:**",
-            f"• Total Candidates: {len(candidates)}",
-            f"• With {persona_label}: {len(candidates_with)} ({len(candidates_with)*100//len(candidates) if candidates else 0}%)",
-            f"• Without {persona_label}: {len(candidates_without)} ({len(candidates_without)*100//len(candidates) if candidates else 0}%)",
+            f"• Total Candidates: {total}",
+            f"• With {persona_label}: {with_count} ({with_pct}%)",
+            f"• Without {persona_label}: {without_count} ({without_pct}%)",
             ""
         ]
         
-        if candidates_with:
+        if with_lines:
             lines.append(f"**✅ Candidates with {persona_label} Information:**")
             lines.append("")
-            for i, (candidate, manager) in enumerate(candidates_with, 1):
-                lines.append(f"{i}. **{candidate.name}**")
-                # Only show role if it's not the default "Employee"
-                if candidate.role_title and candidate.role_title != "Employee":
-                    lines.append(f"   • Role: {candidate.role_title}")
-                lines.append(f"   • {persona_label}: {manager.name} ({manager.email})")
-                lines.append("")
-        
-        if candidates_without:
+            lines.extend(with_lines)
+        
+        if without_lines:
             lines.append(f"**❌ Candidates without {persona_label} Information:**")
             lines.append("")
-            for i, candidate in enumerate(candidates_without, 1):
-                lines.append(f"{i}. **{candidate.name}**")
-                # Only show role if it's not the default "Employee"
-                if candidate.role_title and candidate.role_title != "Employee":
-                    lines.append(f"   • Role: {candidate.role_title}")
-                lines.append("")
+            lines.extend(without_lines)
         
         return "\n".join(lines)
     
@@ -246,7 +259,7 @@ class ResponseFormatter:
                 []
             )
         
-        candidate_tz = pytz.timezone(candidate.location_timezone)
+        candidate_tz = candidate.tz
         limit = len(proposals) if show_all else min(5, len(proposals))  # Show up to 5 options
         
         lines = [
@@ -261,12 +274,15 @@ class ResponseFormatter:
         button_info = []
         
         for i, proposal in enumerate(proposals[:limit], 1):
-            slot = proposal.time_slot
-            candidate_local = slot.start.astimezone(candidate_tz)
+            start = proposal.time_slot.start
+            violated = proposal.constraints_violated
+            candidate_local = start.astimezone(candidate_tz)
             
-            day_name = candidate_local.strftime('%A')
-            date_str = candidate_local.strftime('%B %d, %Y')
-            time_str = candidate_local.strftime('%I:%M %p')
+            # Same output as strftime('%A'), ('%B %d, %Y') and ('%I:%M %p')
+            day_name = _DAY_NAMES[candidate_local.weekday()]
+            date_str = f"{_MONTH_NAMES[candidate_local.month]} {candidate_local.day:02d}, {candidate_local.year}"
+            hour = candidate_local.hour
+            time_str = f"{hour % 12 or 12:02d}:{candidate_local.minute:02d} {'AM' if hour < 12 else 'PM'}"
             
             if i == 1:
                 lines.append(f"⭐ **Option {i} (Best Match)**")
@@ -276,8 +292,8 @@ class ResponseFormatter:
             lines.append(f"   • Date: {day_name}, {date_str}")
             lines.append(f"   • Time: {time_str} ({candidate.location_timezone})")
             
-            if proposal.constraints_violated:
-                lines.append(f"   • ⚠️ Note: {', '.join(proposal.constraints_violated)}")
+            if violated:
+                lines.append(f"   • ⚠️ Note: {', '.join(violated)}")
             
             lines.append("")
             
@@ -1,13 +1,39 @@
 """Core scheduling algorithm."""
 
-from datetime import date, datetime, timedelta, time
+from datetime import date, datetime, timedelta, time, timezone
+from functools import lru_cache
+from heapq import heappush, heapreplace, nlargest
 from typing import Literal, Optional
-
-import pytz
+from zoneinfo import ZoneInfo
 
 from models.entities import MeetingProposal, MeetingRequest, TimeSlot
 from services.calendar_service import CalendarService
 from services.talent_recruit_client import TalentRecruitClient
+from services.time_utils import day_utc_bounds, from_epoch_us, to_epoch_us
+
+
+# Most a slot's time of day can add to its date score (morning + weekday bonus)
+_MAX_TIME_OF_DAY_BONUS = 15
+
+
+@lru_cache(maxsize=1024)
+def _candidate_grid(
+    tz_name: str,
+    start_date: date,
+    end_date: date,
+    business_hours_start: int,
+    business_hours_end: int
+) -> tuple[tuple[int, int], ...]:
+    """Get business-hour windows for each weekday in a date range as UTC epoch microseconds (cached)."""
+    tz = ZoneInfo(tz_name)
+    
+    # Ordinal 1 (0001-01-01) is a Monday, so (ordinal - 1) % 7 is the weekday;
+    # per-day bounds are shared with CalendarService's cache
+    return tuple(
+        day_utc_bounds(tz, date.fromordinal(ordinal), business_hours_start, business_hours_end)
+        for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1)
+        if (ordinal - 1) % 7 < 5  # Skip weekends
+    )
 
 
 class SchedulingEngine:
@@ -68,11 +94,10 @@ class SchedulingEngine:
         if end_date <= start_date:
             end_date = start_date + timedelta(days=7)
         
-        start_datetime = datetime.combine(start_date, time.min).replace(tzinfo=pytz.UTC)
-        end_datetime = datetime.combine(end_date, time.max).replace(tzinfo=pytz.UTC)
+        start_datetime = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+        end_datetime = datetime.combine(end_date, time.max, tzinfo=timezone.utc)
         
         # Get availability for candidate (assume free during business hours)
-        candidate_tz = pytz.timezone(candidate.location_timezone)
         candidate_free_slots = self._get_candidate_availability(
             candidate,
             start_datetime,
@@ -81,14 +106,20 @@ class SchedulingEngine:
             business_hours_end
         )
         
+        all_participants = [request.candidate_id] + [
+            p for p in request.participants if p != request.candidate_id
+        ]
+        
+        # Fetch all participating managers in one batch
+        managers = self.data_client.get_managers_by_ids(all_participants)
+        
         # Get availability for each manager
         manager_availabilities: dict[str, list[TimeSlot]] = {}
         for manager_id in request.participants:
             if manager_id == request.candidate_id:
                 continue
             
-            manager = self.data_client.get_manager_by_id(manager_id)
-            if not manager:
+            if manager_id not in managers:
                 continue
             
             free_slots = self.calendar_service.get_merged_availability(
@@ -100,33 +131,77 @@ class SchedulingEngine:
             )
             manager_availabilities[manager_id] = free_slots
         
-        # Find overlapping slots
-        all_participants = [request.candidate_id] + [
-            p for p in request.participants if p != request.candidate_id
-        ]
-        
+        # Find overlapping slots (epoch-microsecond pairs)
         overlapping_slots = self._find_overlapping_slots(
             candidate_free_slots,
             manager_availabilities,
             request.duration_minutes
         )
         
-        # Score and rank proposals
-        proposals = []
-        for slot in overlapping_slots:
-            proposal = self._create_proposal(
-                slot,
+        # Resolve each participant's timezone once for all slots
+        participant_tzs: list[tuple[str, ZoneInfo]] = []
+        for participant_id in all_participants:
+            if participant_id == candidate.id:
+                participant_tzs.append((participant_id, candidate.tz))
+                continue
+            
+            manager = managers.get(participant_id)
+            if manager:
+                participant_tzs.append((participant_id, manager.tz))
+        
+        # Cheap upper bound per slot from its date alone (shared by all slots on a day)
+        slot_starts = [from_epoch_us(slot_start) for slot_start, _ in overlapping_slots]
+        date_scores: dict[date, float] = {}
+        bounds = []
+        for slot_start in slot_starts:
+            slot_date = slot_start.date()
+            if slot_date not in date_scores:
+                date_scores[slot_date] = self._date_score(slot_date, request, candidate)
+            bounds.append(max(0, date_scores[slot_date] + _MAX_TIME_OF_DAY_BONUS))
+        
+        # Fully score slots in bound order until no remaining slot can reach the top N
+        scores: dict[int, float] = {}
+        top_scores: list[float] = []  # min-heap of the best max_proposals scores so far
+        for i in sorted(range(len(bounds)), key=bounds.__getitem__, reverse=True):
+            if 0 < max_proposals <= len(top_scores) and bounds[i] < top_scores[0]:
+                break
+            
+            score = self._score_slot(
+                slot_starts[i],
                 request,
                 candidate,
-                all_participants,
+                participant_tzs,
                 business_hours_start,
                 business_hours_end
             )
-            proposals.append(proposal)
+            scores[i] = score
+            if len(top_scores) < max_proposals:
+                heappush(top_scores, score)
+            elif top_scores and score > top_scores[0]:
+                heapreplace(top_scores, score)
+        
+        # Top N by score (higher is better); ties keep slot order
+        ranked = nlargest(max_proposals, scores, key=lambda i: (scores[i], -i))
         
-        # Sort by score (higher is better) and return top N
-        proposals.sort(key=lambda p: p.score, reverse=True)
-        return proposals[:max_proposals]
+        # Every slot shares one immutable participants tuple (candidate first)
+        participants = (candidate.id, *manager_availabilities)
+        source = "intersection" if manager_availabilities else "candidate_business_hours"
+        return [
+            self._create_proposal(
+                TimeSlot(
+                    start=slot_starts[i],
+                    end=from_epoch_us(overlapping_slots[i][1]),
+                    participants=participants,
+                    source=source
+                ),
+                request,
+                candidate,
+                participant_tzs,
+                business_hours_start,
+                business_hours_end
+            )
+            for i in ranked
+        ]
     
     def _get_candidate_availability(
         self,
@@ -135,109 +210,107 @@ class SchedulingEngine:
         end_datetime: datetime,
         business_hours_start: int,
         business_hours_end: int
-    ) -> list[TimeSlot]:
-        """Get candidate availability (assume free during business hours)."""
-        tz = pytz.timezone(candidate.location_timezone)
-        free_slots = []
+    ) -> list[tuple[int, int]]:
+        """Get candidate availability (assume free during business hours) as epoch-microsecond pairs."""
+        windows = _candidate_grid(
+            candidate.location_timezone,
+            start_datetime.date(),
+            end_datetime.date(),
+            business_hours_start,
+            business_hours_end
+        )
+        range_start = to_epoch_us(start_datetime)
+        range_end = to_epoch_us(end_datetime)
         
-        current_date = start_datetime.date()
-        end_date = end_datetime.date()
-        
-        while current_date <= end_date:
-            # Skip weekends
-            if current_date.weekday() < 5:
-                local_start = tz.localize(
-                    datetime.combine(current_date, time(business_hours_start, 0))
-                )
-                local_end = tz.localize(
-                    datetime.combine(current_date, time(business_hours_end, 0))
-                )
-                
-                slot_start_utc = local_start.astimezone(pytz.UTC)
-                slot_end_utc = local_end.astimezone(pytz.UTC)
-                
-                # Clamp to requested range
-                slot_start = max(slot_start_utc, start_datetime)
-                slot_end = min(slot_end_utc, end_datetime)
-                
-                if slot_start < slot_end:
-                    free_slots.append(TimeSlot(
-                        start=slot_start,
-                        end=slot_end,
-                        participants=[candidate.id],
-                        source="candidate_business_hours"
-                    ))
+        free_slots = []
+        for slot_start_utc, slot_end_utc in windows:
+            # Clamp to requested range
+            slot_start = max(slot_start_utc, range_start)
+            slot_end = min(slot_end_utc, range_end)
             
-            current_date += timedelta(days=1)
+            if slot_start < slot_end:
+                free_slots.append((slot_start, slot_end))
         
         return free_slots
     
     def _find_overlapping_slots(
         self,
-        candidate_slots: list[TimeSlot],
+        candidate_slots: list[tuple[int, int]],
         manager_availabilities: dict[str, list[TimeSlot]],
         duration_minutes: int
-    ) -> list[TimeSlot]:
-        """Find overlapping time slots across all participants."""
-        if not manager_availabilities:
-            # No managers, return candidate slots split by duration
-            return self._split_slots_by_duration(candidate_slots, duration_minutes)
+    ) -> list[tuple[int, int]]:
+        """
+        Find meeting-sized slots free for all participants.
         
-        # Start with candidate slots
+        Intersection and splitting run on (start, end) epoch-microsecond pairs;
+        callers build TimeSlots only for the slots they keep.
+        """
+        # Start with candidate slots and intersect with each manager's availability
         overlapping = candidate_slots
-        
-        # Intersect with each manager's availability
-        for manager_id, manager_slots in manager_availabilities.items():
-            overlapping = self._intersect_slots(overlapping, manager_slots)
+        for manager_slots in manager_availabilities.values():
+            overlapping = self._intersect_slots(
+                overlapping,
+                [(to_epoch_us(slot.start), to_epoch_us(slot.end)) for slot in manager_slots]
+            )
         
         # Split into meeting-sized slots
         return self._split_slots_by_duration(overlapping, duration_minutes)
     
     def _intersect_slots(
         self,
-        slots1: list[TimeSlot],
-        slots2: list[TimeSlot]
-    ) -> list[TimeSlot]:
-        """Find intersection of two slot lists."""
-        result = []
+        slots1: list[tuple[int, int]],
+        slots2: list[tuple[int, int]]
+    ) -> list[tuple[int, int]]:
+        """
+        Find intersection of two lists of (start, end) pairs.
+        
+        Overlaps are found with a two-pointer sweep over both lists in start
+        order.
+        """
+        if not slots1 or not slots2:
+            return []
         
-        for slot1 in slots1:
-            for slot2 in slots2:
-                # Find overlap
-                overlap_start = max(slot1.start, slot2.start)
-                overlap_end = min(slot1.end, slot2.end)
-                
-                if overlap_start < overlap_end:
-                    # Merge participants
-                    all_participants = list(set(slot1.participants + slot2.participants))
-                    result.append(TimeSlot(
-                        start=overlap_start,
-                        end=overlap_end,
-                        participants=all_participants,
-                        source="intersection"
-                    ))
+        slots1 = sorted(slots1)
+        slots2 = sorted(slots2)
+        
+        result = []
+        append = result.append
+        count1 = len(slots1)
+        count2 = len(slots2)
+        i = j = 0
+        while i < count1 and j < count2:
+            start1, end1 = slots1[i]
+            start2, end2 = slots2[j]
+            
+            # Find overlap (plain comparisons avoid max()/min() call overhead)
+            overlap_start = start1 if start1 > start2 else start2
+            overlap_end = end1 if end1 < end2 else end2
+            
+            if overlap_start < overlap_end:
+                append((overlap_start, overlap_end))
+            
+            # Advance whichever slot finishes first
+            if end1 < end2:
+                i += 1
+            else:
+                j += 1
         
         return result
     
     def _split_slots_by_duration(
         self,
-        slots: list[TimeSlot],
+        slots: list[tuple[int, int]],
         duration_minutes: int
-    ) -> list[TimeSlot]:
-        """Split long slots into meeting-sized chunks."""
+    ) -> list[tuple[int, int]]:
+        """Split long (start, end) pairs into meeting-sized chunks."""
         result = []
-        duration_delta = timedelta(minutes=duration_minutes)
-        
-        for slot in slots:
-            current_start = slot.start
-            while current_start + duration_delta <= slot.end:
-                result.append(TimeSlot(
-                    start=current_start,
-                    end=current_start + duration_delta,
-                    participants=slot.participants,
-                    source=slot.source
-                ))
-                current_start += duration_delta
+        duration = duration_minutes * 60_000_000
+        
+        for slot_start, slot_end in slots:
+            result.extend(
+                (chunk_start, chunk_start + duration)
+                for chunk_start in range(slot_start, slot_end - duration + 1, duration)
+            )
         
         return result
     
@@ -246,19 +319,44 @@ class SchedulingEngine:
         slot: TimeSlot,
         request: MeetingRequest,
         candidate,
-        all_participants: list[str],
+        participant_tzs: list[tuple[str, ZoneInfo]],
         business_hours_start: int,
         business_hours_end: int
     ) -> MeetingProposal:
         """Create a meeting proposal with scoring."""
-        score = 100.0
         violations = []
+        score = self._score_slot(
+            slot.start,
+            request,
+            candidate,
+            participant_tzs,
+            business_hours_start,
+            business_hours_end,
+            violations
+        )
+        
+        return MeetingProposal(
+            time_slot=slot,
+            meeting_type=request.meeting_type,
+            score=score,
+            constraints_violated=tuple(violations)
+        )
+    
+    def _date_score(
+        self,
+        slot_date: date,
+        request: MeetingRequest,
+        candidate,
+        violations: Optional[list[str]] = None
+    ) -> float:
+        """Score the date-only criteria of a slot (deadline and distance from start date)."""
+        score = 100.0
         
         # Check if within deadline
-        slot_date = slot.start.date()
         if slot_date > request.deadline_date:
             score -= 50
-            violations.append("After deadline")
+            if violations is not None:
+                violations.append("After deadline")
         
         # Prefer earlier dates (closer to start date)
         days_from_start = abs((slot_date - candidate.start_date).days)
@@ -267,41 +365,50 @@ class SchedulingEngine:
         elif days_from_start > 3:
             score -= 10
         
+        return score
+    
+    def _score_slot(
+        self,
+        slot_start: datetime,
+        request: MeetingRequest,
+        candidate,
+        participant_tzs: list[tuple[str, ZoneInfo]],
+        business_hours_start: int,
+        business_hours_end: int,
+        violations: Optional[list[str]] = None
+    ) -> float:
+        """
+        Score a slot by its UTC start time (higher is better).
+        
+        Violation messages are only built when a ``violations`` list is passed,
+        so ranking a large batch of slots stays cheap.
+        """
+        score = self._date_score(slot_start.date(), request, candidate, violations)
+        
+        # Candidate's local hour, reused for participants in the same timezone
+        candidate_hour = slot_start.astimezone(candidate.tz).hour
+        
         # Check business hours for all participants
-        for participant_id in all_participants:
-            if participant_id == candidate.id:
-                tz = pytz.timezone(candidate.location_timezone)
-            else:
-                manager = self.data_client.get_manager_by_id(participant_id)
-                if not manager:
-                    continue
-                tz = pytz.timezone(manager.location_timezone)
-            
-            local_time = slot.start.astimezone(tz)
-            hour = local_time.hour
+        for participant_id, tz in participant_tzs:
+            hour = candidate_hour if tz is candidate.tz else slot_start.astimezone(tz).hour
             
             if hour < business_hours_start:
                 score -= 15
-                violations.append(f"Before business hours for {participant_id}")
+                if violations is not None:
+                    violations.append(f"Before business hours for {participant_id}")
             elif hour >= business_hours_end:
                 score -= 15
-                violations.append(f"After business hours for {participant_id}")
+                if violations is not None:
+                    violations.append(f"After business hours for {participant_id}")
         
         # Prefer morning slots (9-12) over afternoon/evening
-        candidate_local = slot.start.astimezone(pytz.timezone(candidate.location_timezone))
-        if 9 <= candidate_local.hour < 12:
+        if 9 <= candidate_hour < 12:
             score += 10
-        elif candidate_local.hour >= 17:
+        elif candidate_hour >= 17:
             score -= 5
         
         # Prefer weekdays (already enforced, but add bonus)
-        if slot.start.weekday() < 5:
+        if slot_start.weekday() < 5:
             score += 5
         
-        return MeetingProposal(
-            time_slot=slot,
-            meeting_type=request.meeting_type,
-            score=max(0, score),  # Ensure non-negative
-            constraints_violated=violations
-        )
-
+        return max(0, score)  # Ensure non-negative
@@ -1,6 +1,7 @@
 """Employee data client service - Uses Darwinbox API as the data source."""
 
 import os
+import time
 from datetime import date, timedelta
 from typing import Optional, Dict, Any, List
 
@@ -8,6 +9,17 @@ from models.entities import Candidate, Manager
 from services.darwinbox_client import DarwinboxClient
 
 
+# Seconds before the cached employee list is refetched from Darwin API
+EMPLOYEE_CACHE_TTL_SECONDS = 300
+
+# extract_manager_info keys, in lookup priority order, with the role each maps to
+_MANAGER_ROLES = (
+    ("hrbp", "HRBP"),
+    ("hiring_manager", "Hiring Manager"),
+    ("reporting_manager", "Reporting Manager"),
+)
+
+
 class TalentRecruitClient:
     """
     Client for employee and candidate data.
@@ -32,6 +44,11 @@ class TalentRecruitClient:
         self._managers_cache: Dict[str, Manager] = {}
         self._candidates_list_cache: List[Candidate] = []
         self._raw_api_data_cache: List[Dict[str, Any]] = []
+        self._raw_api_data_fetched_at = 0.0
+        # Manager ID -> Manager for every manager referenced by the cached employees
+        self._manager_index: Dict[str, Manager] = {}
+        # Employee ID -> Candidate for the cached employees, built on first fallback lookup
+        self._candidate_index: Optional[Dict[str, Candidate]] = None
     
     def clear_cache(self):
         """Clear all caches."""
@@ -39,6 +56,9 @@ class TalentRecruitClient:
         self._managers_cache.clear()
         self._candidates_list_cache.clear()
         self._raw_api_data_cache.clear()
+        self._raw_api_data_fetched_at = 0.0
+        self._manager_index.clear()
+        self._candidate_index = None
     
     def _get_field(self, data: Dict[str, Any], *keys: str, default: str = "") -> str:
         """Helper to get value with multiple field name variations."""
@@ -157,21 +177,48 @@ class TalentRecruitClient:
             calendar_ids={"apexon": f"apexon_cal_{manager_id}"}
         )
     
+    def _employee_data_expired(self) -> bool:
+        """Whether the cached employee list is older than EMPLOYEE_CACHE_TTL_SECONDS."""
+        return time.monotonic() - self._raw_api_data_fetched_at >= EMPLOYEE_CACHE_TTL_SECONDS
+    
+    def _refresh_if_stale(self):
+        """Refetch employees (and drop the entities mapped from them) once the cache expires."""
+        if self._raw_api_data_cache and self._employee_data_expired():
+            self._fetch_all_employees(use_cache=False)
+    
     def _fetch_all_employees(self, use_cache: bool = True) -> List[Dict[str, Any]]:
-        """Fetch all employees from Darwin API."""
-        if use_cache and self._raw_api_data_cache:
+        """Fetch all employees from Darwin API (cached for EMPLOYEE_CACHE_TTL_SECONDS)."""
+        if use_cache and self._raw_api_data_cache and not self._employee_data_expired():
             return self._raw_api_data_cache
         
         try:
             employees_data = self.darwinbox_client.get_all_employees()
-            self._raw_api_data_cache = employees_data
-            return employees_data
         except Exception as e:
             print(f"Error fetching employees from Darwin API: {e}")
-            return []
+            employees_data = []
+        
+        # get_all_employees returns [] on API errors: keep serving the last good
+        # list and try again after another TTL rather than wiping working data
+        if not employees_data:
+            if self._raw_api_data_cache:
+                self._raw_api_data_fetched_at = time.monotonic()
+            return self._raw_api_data_cache
+        
+        self._raw_api_data_cache = employees_data
+        self._raw_api_data_fetched_at = time.monotonic()
+        self._manager_index = self._build_manager_index(employees_data)
+        
+        # Entities mapped from the previous employee list are stale now
+        self._candidates_cache.clear()
+        self._managers_cache.clear()
+        self._candidates_list_cache = []
+        self._candidate_index = None
+        return employees_data
     
     def get_candidate_by_id(self, candidate_id: str) -> Optional[Candidate]:
         """Get a candidate by ID (employee ID from Darwin API)."""
+        self._refresh_if_stale()
+        
         # Check cache first
         if candidate_id in self._candidates_cache:
             return self._candidates_cache[candidate_id]
@@ -194,25 +241,30 @@ class TalentRecruitClient:
         except Exception as e:
             print(f"Error fetching employee {candidate_id} from Darwin API: {e}")
         
-        # Fallback: search in cached API data
+        # Fallback: look up in the index of cached API data
         employees_data = self._fetch_all_employees(use_cache=True)
-        for employee_data in employees_data:
-            mapped_candidate = self._map_employee_to_candidate(employee_data)
-            if mapped_candidate:
-                if mapped_candidate.id == candidate_id or str(mapped_candidate.id) == str(candidate_id):
-                    self._candidates_cache[candidate_id] = mapped_candidate
-                    return mapped_candidate
+        if self._candidate_index is None:
+            self._candidate_index = {}
+            for employee_data in employees_data:
+                mapped_candidate = self._map_employee_to_candidate(employee_data)
+                if mapped_candidate:
+                    self._candidate_index.setdefault(mapped_candidate.id, mapped_candidate)
         
-        return None
+        mapped_candidate = self._candidate_index.get(str(candidate_id))
+        if mapped_candidate:
+            self._candidates_cache[candidate_id] = mapped_candidate
+        return mapped_candidate
     
     def list_candidates(self) -> List[Candidate]:
         """List all candidates from Darwin API."""
+        self._refresh_if_stale()
+        
         # Return cached list if available
         if self._candidates_list_cache:
             return self._candidates_list_cache
         
-        # Fetch from Darwin API
-        employees_data = self._fetch_all_employees(use_cache=False)
+        # Fetch from Darwin API (reusing an employee list that is still fresh)
+        employees_data = self._fetch_all_employees(use_cache=True)
         
         if not employees_data:
             return []
@@ -229,46 +281,54 @@ class TalentRecruitClient:
     
     def get_manager_by_id(self, manager_id: str) -> Optional[Manager]:
         """Get a manager by ID."""
+        self._refresh_if_stale()
+        
         # Check cache first
         if manager_id in self._managers_cache:
             return self._managers_cache[manager_id]
         
-        # Try to find manager from cached employees
-        employees_data = self._fetch_all_employees(use_cache=True)
+        # Look up in the index built from cached employees
+        self._fetch_all_employees(use_cache=True)
+        manager = self._manager_index.get(manager_id)
+        if manager:
+            self._managers_cache[manager_id] = manager
+        return manager
+    
+    def get_managers_by_ids(self, manager_ids: List[str]) -> Dict[str, Manager]:
+        """
+        Get several managers by ID with at most one employee fetch.
+        
+        Returns:
+            dict mapping manager ID to Manager (unknown IDs are omitted)
+        """
+        self._fetch_all_employees(use_cache=True)
+        
+        managers = {}
+        for manager_id in manager_ids:
+            manager = self.get_manager_by_id(manager_id)
+            if manager:
+                managers[manager_id] = manager
+        return managers
+    
+    def _build_manager_index(self, employees_data: List[Dict[str, Any]]) -> Dict[str, Manager]:
+        """
+        Index every manager referenced by the given employees by manager ID.
+        
+        The first employee (and, within it, the first role in _MANAGER_ROLES)
+        that references a manager decides that manager's role.
+        """
+        index: Dict[str, Manager] = {}
         for employee_data in employees_data:
             manager_info = self.darwinbox_client.extract_manager_info(employee_data)
-            
-            # Check HRBP
-            if manager_info.get("hrbp") and manager_info["hrbp"].get("email"):
-                hrbp_email = manager_info["hrbp"]["email"]
-                potential_id = f"mgr_{hrbp_email}"
-                if potential_id == manager_id:
-                    manager = self._create_manager_from_email(hrbp_email, role="HRBP")
-                    if manager:
-                        self._managers_cache[manager_id] = manager
-                        return manager
-            
-            # Check Hiring Manager
-            if manager_info.get("hiring_manager") and manager_info["hiring_manager"].get("email"):
-                hm_email = manager_info["hiring_manager"]["email"]
-                potential_id = f"mgr_{hm_email}"
-                if potential_id == manager_id:
-                    manager = self._create_manager_from_email(hm_email, role="Hiring Manager")
-                    if manager:
-                        self._managers_cache[manager_id] = manager
-                        return manager
-            
-            # Check Reporting Manager
-            if manager_info.get("reporting_manager") and manager_info["reporting_manager"].get("email"):
-                rm_email = manager_info["reporting_manager"]["email"]
-                potential_id = f"mgr_{rm_email}"
-                if potential_id == manager_id:
-                    manager = self._create_manager_from_email(rm_email, role="Reporting Manager")
-                    if manager:
-                        self._managers_cache[manager_id] = manager
-                        return manager
-        
-        return None
+            for key, role in _MANAGER_ROLES:
+                info = manager_info.get(key)
+                email = info.get("email") if info else None
+                if not email or f"mgr_{email}" in index:
+                    continue
+                manager = self._create_manager_from_email(email, role=role)
+                if manager:
+                    index[manager.id] = manager
+        return index
     
     def get_related_personas_for_candidate(self, candidate_id: str) -> Dict[str, Manager]:
         """
@@ -278,6 +338,8 @@ class TalentRecruitClient:
             dict with keys: "hiring_manager", "reporting_manager", "hrbp" (if available)
             Note: Recruiter info is NOT available in Darwin API
         """
+        self._refresh_if_stale()
+        
         # Cache keys
         hiring_manager_cache_key = f"hiring_manager_{candidate_id}"
         reporting_manager_cache_key = f"reporting_manager_{candidate_id}"
@@ -341,6 +403,26 @@ class TalentRecruitClient:
         
         return result
     
+    def get_related_personas_bulk(self, candidate_ids: List[str]) -> Dict[str, Dict[str, Manager]]:
+        """
+        Get related personas for several candidates.
+        
+        Uncached employees are fetched from Darwin API in a single request first,
+        so the per-candidate lookups are served from the cache.
+        
+        Returns:
+            dict mapping candidate ID to its personas dict
+        """
+        try:
+            self.darwinbox_client.prefetch(candidate_ids)
+        except Exception as e:
+            print(f"Error prefetching employees from Darwin API: {e}")
+        
+        return {
+            candidate_id: self.get_related_personas_for_candidate(candidate_id)
+            for candidate_id in candidate_ids
+        }
+    
     def get_candidate_documents(self, candidate_id: str) -> List[Dict[str, Any]]:
         """
         Get documents for a candidate.
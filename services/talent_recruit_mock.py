@@ -1,6 +1,7 @@
 """Mock employee data service for synthetic/testing data."""
 
 from datetime import date, timedelta
+from functools import cached_property
 from typing import Optional
 
 from models.entities import Candidate, Manager
@@ -15,10 +16,22 @@ class TalentRecruitClientMock:
     synthetic data for testing purposes.
     """
     
-    def __init__(self):
-        """Initialize with synthetic data."""
-        self._candidates = self._generate_candidates()
-        self._managers = self._generate_managers()
+    # Synthetic data and its ID indexes are built on first access
+    @cached_property
+    def _candidates(self) -> list[Candidate]:
+        return self._generate_candidates()
+    
+    @cached_property
+    def _managers(self) -> list[Manager]:
+        return self._generate_managers()
+    
+    @cached_property
+    def _candidates_by_id(self) -> dict[str, Candidate]:
+        return {c.id: c for c in self._candidates}
+    
+    @cached_property
+    def _managers_by_id(self) -> dict[str, Manager]:
+        return {m.id: m for m in self._managers}
     
     def _generate_candidates(self) -> list[Candidate]:
         """Generate synthetic candidates."""
@@ -133,10 +146,7 @@ class TalentRecruitClientMock:
     
     def get_candidate_by_id(self, candidate_id: str) -> Optional[Candidate]:
         """Get a candidate by ID."""
-        for candidate in self._candidates:
-            if candidate.id == candidate_id:
-                return candidate
-        return None
+        return self._candidates_by_id.get(candidate_id)
     
     def list_candidates(self) -> list[Candidate]:
         """List all candidates."""
@@ -144,10 +154,16 @@ class TalentRecruitClientMock:
     
     def get_manager_by_id(self, manager_id: str) -> Optional[Manager]:
         """Get a manager by ID."""
-        for manager in self._managers:
-            if manager.id == manager_id:
-                return manager
-        return None
+        return self._managers_by_id.get(manager_id)
+    
+    def get_managers_by_ids(self, manager_ids: list[str]) -> dict[str, Manager]:
+        """Get several managers by ID, keyed by ID (unknown IDs are omitted)."""
+        managers = {}
+        for manager_id in manager_ids:
+            manager = self.get_manager_by_id(manager_id)
+            if manager:
+                managers[manager_id] = manager
+        return managers
     
     def get_related_personas_for_candidate(self, candidate_id: str) -> dict:
         """
@@ -177,4 +193,11 @@ class TalentRecruitClientMock:
             result["hrbp"] = hrbp
         
         return result
+    
+    def get_related_personas_bulk(self, candidate_ids: list[str]) -> dict[str, dict]:
+        """Get related personas for several candidates, keyed by candidate ID."""
+        return {
+            candidate_id: self.get_related_personas_for_candidate(candidate_id)
+            for candidate_id in candidate_ids
+        }
 
@@ -0,0 +1,32 @@
+"""Epoch-microsecond time helpers shared by the calendar and scheduling services."""
+
+from datetime import date, datetime, timedelta, time, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """Convert an aware datetime to integer microseconds since the UTC epoch."""
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(ts: int) -> datetime:
+    """Convert integer microseconds since the UTC epoch to a UTC datetime."""
+    return _EPOCH + timedelta(microseconds=ts)
+
+
+@lru_cache(maxsize=4096)
+def day_utc_bounds(
+    tz: ZoneInfo,
+    day: date,
+    business_hours_start: int,
+    business_hours_end: int
+) -> tuple[int, int]:
+    """Get business hours on a local calendar day as UTC epoch microseconds (cached)."""
+    local_start = datetime.combine(day, time(business_hours_start, 0), tzinfo=tz)
+    local_end = datetime.combine(day, time(business_hours_end, 0), tzinfo=tz)
+    return to_epoch_us(local_start), to_epoch_us(local_end)
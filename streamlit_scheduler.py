@@ -1,23 +1,23 @@
 """Conversational Scheduling Agent - Streamlined UX."""
 
-import ast
 import hashlib
 import json
 import os
 import re
-from datetime import date, datetime, timedelta
-from typing import Optional, Dict, Any, List
+import time
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Callable, Optional, Dict, Any, List
 
-import pytz
 import streamlit as st
 from dotenv import load_dotenv
 from openai import OpenAI
 
-from models.entities import MeetingRequest
+from models.entities import Candidate, MeetingRequest, char_mask
 from services.calendar_service import CalendarService
 from services.email_service_mock import EmailServiceMock
 from services.scheduling_engine import SchedulingEngine
-from services.talent_recruit_client import TalentRecruitClient
+from services.talent_recruit_client import EMPLOYEE_CACHE_TTL_SECONDS, TalentRecruitClient
 from services.response_formatter import ResponseFormatter
 
 # ============================================================================
@@ -35,6 +35,63 @@ if not OPENAI_API_KEY:
 
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
+# Completion cap for intent parsing; the reply is a single small JSON object
+INTENT_MAX_TOKENS = 150
+
+# System prompt for intent parsing (sent with every parse request)
+INTENT_SYSTEM_PROMPT = """You are an intelligent meeting scheduling assistant. Parse user queries naturally and extract structured information.
+
+Available meeting types (return EXACTLY as shown):
+- "Intro with Hiring Manager"
+- "Intro with Reporting Manager"
+- "Intro with HRBP"
+- "Intro with Buddy"
+
+IMPORTANT: "Intro with Recruiter" is NOT available - Darwin API does not provide recruiter information.
+
+Available intents:
+- list_candidates: Show available candidates from Darwin API (MUST extract count if user specifies a number)
+- list_candidates_with_hiring_managers: List candidates showing hiring manager availability (whose hiring manager info is available, who has hiring manager info, which candidates have hiring manager, etc.)
+- select_candidate: Choose a candidate (extract name if mentioned)
+- view_candidate_details: Show detailed information about a candidate (info, details, about, who is)
+- configure_meeting: Set up meeting details
+- set_duration: Specify meeting duration
+- generate_proposals: Find available meeting times
+- confirm_booking: User confirms they want to book (yes, confirm, book it, etc)
+- send_invites: Send meeting invitations
+- view_email: Show email content
+- start_over: Restart the process
+- help: User needs assistance
+
+IMPORTANT PARSING RULES:
+1. COUNT EXTRACTION IS CRITICAL: If user says "show me 10 candidates" or "list 5 candidates" or "10 candidates", you MUST:
+   - Set intent: "list_candidates"
+   - Set count: the number they specified as an integer, not a string
+   - Examples: "show me 10" → count=10, "list 20 candidates" → count=20, "10 people" → count=10, a bare "X" when listing candidates → count=X
+   - "list candidates" (no number) → count=null
+2. If user says "choose [name] and [action]", extract name AND set intent to the action
+3. For "30 min with hiring manager" → extract both duration and type
+4. "yes", "confirm", "book it", "send it" → intent: confirm_booking
+5. Handle typos intelligently (hring→hiring, manaegr→manager)
+6. "show me more candidates" or "show more candidates" → intent: list_candidates (increment offset, keep current count)
+6a. "show me more", "other options" (for proposals) → intent: generate_proposals with show_all: true
+7. Recognize complete requests: "Schedule John Smith for 45 min hiring manager meeting" should extract ALL info
+8. IMPORTANT: Recruiter information is NOT available from Darwin API - NEVER set meeting_type to "Intro with Recruiter"
+9. Queries about "whose hiring manager", "who has hiring manager", "hiring manager info available", "which candidates have hiring manager" → intent: list_candidates_with_hiring_managers
+10. If user asks about recruiter, politely inform them that recruiter information is not available from Darwin API
+
+Return JSON with:
+{
+    "intent": "primary_intent",
+    "candidate_name": "extracted name or null",
+    "meeting_type": "meeting type or null",
+    "duration": number or null,
+    "count": number or null,
+    "wants_proposals": true/false,
+    "show_all": true/false,
+    "confidence": 0.0-1.0
+}"""
+
 st.set_page_config(
     page_title="Scheduling Assistant",
     page_icon="🗓️",
@@ -60,6 +117,51 @@ def get_services(_cache_version="v3.4"):
     email_service = EmailServiceMock(data_client)
     return data_client, calendar_service, scheduling_engine, email_service
 
+@st.cache_resource(ttl=600)
+def get_candidates() -> tuple:
+    """
+    Candidate list shared across reruns and sessions (cached).
+    
+    Returned as a tuple so callers can't mutate the shared copy; cache_resource
+    hands back the same object instead of unpickling a copy on every call.
+    """
+    return tuple(data_client.list_candidates())
+
+def clear_candidate_caches():
+    """Drop the cached candidate list and everything derived from it."""
+    get_candidates.clear()
+    get_candidate_name_index.clear()
+    get_candidate_name_pattern.clear()
+    get_candidates_by_name.clear()
+
+# Conversations rendered in the sidebar per "Load more" step
+HISTORY_PAGE_SIZE = 10
+
+# Styles for sidebar conversation cards (emitted once per render, not per card)
+HISTORY_CARD_CSS = """
+<style>
+.conv-card button {
+    width: 100% !important;
+    text-align: left !important;
+    padding: 12px !important;
+    border-radius: 8px !important;
+    white-space: pre-wrap !important;
+    font-weight: normal !important;
+    height: auto !important;
+    min-height: 60px !important;
+    margin: 8px 0 !important;
+}
+.conv-card-current button {
+    border: 2px solid #1f77b4 !important;
+    background-color: rgba(31, 119, 180, 0.15) !important;
+}
+.conv-card-other button {
+    border: 1px solid rgba(255, 255, 255, 0.1) !important;
+    background-color: rgba(255, 255, 255, 0.02) !important;
+}
+</style>
+"""
+
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
@@ -96,10 +198,132 @@ if "chat_history" not in st.session_state:
 if "candidate_list_offset" not in st.session_state:
     st.session_state.candidate_list_offset = 0
 
+# Initialize per-session cache of candidate personas: candidate ID -> (fetched at, personas).
+# Entries expire with the data client's employee cache and are cleared on start over,
+# reset and restore.
+if "persona_cache" not in st.session_state:
+    st.session_state.persona_cache = {}
+
+# Initialize sidebar history paging
+if "history_visible" not in st.session_state:
+    st.session_state.history_visible = HISTORY_PAGE_SIZE
+
+# Next id for saved conversations (stable widget keys across reordering)
+if "history_next_id" not in st.session_state:
+    st.session_state.history_next_id = 0
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Prompt patterns used by auto_extract_all_info
+_POSSESSIVE_RE = re.compile(r"(\w+(?:\s+\w+)*)\s*'s\s+")  # "john doe's"
+_WITH_RE = re.compile(r"(?:setup|schedule|meet|call)\s+(\w+(?:\s+\w+)*)\s+with")  # "setup john with"
+_DURATION_RE = re.compile(r'(\d+)\s*(?:min|minutes|minute)')  # "30 min"
+
+# Whole-prompt patterns classified without an OpenAI call (see fast_intent)
+_FAST_CONFIRM_RE = re.compile(r"^(?:yes|y|confirm|book it|send it|go)[.!]*$")
+_FAST_HELP_RE = re.compile(r"^help[?!.]*$")
+_FAST_LIST_RE = re.compile(r"^(?:list|show)\s+candidates?$")
+_FAST_COUNT_RE = re.compile(r"^(\d+)\s*candidates?$")
+
+# Chat-turn patterns: proposal option picks, pronouns, and candidate counts (tried in order)
+_OPTION_RE = re.compile(r'option\s*(\d+)')
+_PRONOUN_RE = re.compile(r'his|her|their|him|she|they')  # substrings, like the keyword checks
+_COUNT_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'show\s+(?:me\s+)?(\d+)\s*(?:candidates?|people|employees?)?',
+    r'list\s+(\d+)\s*(?:candidates?|people|employees?)?',
+    r'(\d+)\s+candidates?',
+    r'(\d+)\s+people',
+    r'(\d+)\s+employees?',
+    r'give\s+me\s+(\d+)',
+    r'display\s+(\d+)',
+    r'(\d+)\s*$',
+))
+
+# Keyword sets for rule-based intent detection (matched as substrings of the prompt)
+_HM_QUERY_WORDS = ("info", "available", "whose", "who has")
+_HM_QUERY_PHRASES = (
+    "whose hiring manager", "who has hiring manager", "hiring manager info",
+    "hiring manager available", "which candidates have hiring manager",
+    "candidates with hiring manager", "hiring manager information"
+)
+_RECRUITER_QUERY_PHRASES = ("whose recruiter", "who has recruiter", "recruiter info available")
+_MORE_CANDIDATES_PHRASES = ("show more candidates", "show more", "next candidates", "more candidates")
+_SHOW_MORE_PHRASES = _MORE_CANDIDATES_PHRASES + ("continue", "load more")
+_LIST_WORDS = ("list", "show", "see")
+_CONFIRM_WORDS = ("yes", "confirm", "book", "send", "good", "perfect", "ok")
+_FIND_WORDS = ("find", "available", "times", "proposals", "when", "schedule")
+_EMAIL_WORDS = ("email", "view email", "show email", "see email", "sent email")
+_RECRUITER_WORDS = ("recruiter", "recruiters", "who recruited")
+_DETAIL_WORDS = ("info", "details", "about", "who is", "tell me about")
+_RESET_WORDS = ("start over", "reset", "restart", "new")
+_SETUP_WORDS = ("setup", "set up", "configure", "schedule")
+
+# Meeting-type keywords in priority order (only Darwin API supported types).
+# "hiring manager" / "reporting manager" contain their keyword, so they need no entry.
+_MEETING_TYPE_KEYWORDS = (
+    ("hiring", "Intro with Hiring Manager"),
+    ("reporting", "Intro with Reporting Manager"),
+    ("hrbp", "Intro with HRBP"),
+    ("hr bp", "Intro with HRBP"),
+    ("buddy", "Intro with Buddy"),
+)
+_MEETING_TYPE_RE = re.compile("|".join(re.escape(keyword) for keyword, _ in _MEETING_TYPE_KEYWORDS))
+
+# Meeting-type keyword -> persona key of the required participant, in priority order
+# (recruiters are recognized only to explain that Darwin API doesn't provide them)
+_MEETING_TYPE_PERSONAS = (
+    ("hiring", "hiring_manager"),
+    ("reporting", "reporting_manager"),
+    ("hrbp", "hrbp"),
+    ("buddy", "buddy"),
+    ("recruiter", "recruiter"),
+)
+# Lookahead so overlapping keywords are all found in one scan
+_MEETING_TYPE_PERSONA_RE = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword, _ in _MEETING_TYPE_PERSONAS) + "))"
+)
+
+# Persona key -> (title, sentence label, personas offered instead when it is missing)
+_PERSONAS = {
+    "hiring_manager": ("Hiring Manager", "Hiring manager", ("hrbp", "reporting_manager")),
+    "reporting_manager": ("Reporting Manager", "Reporting manager", ("hrbp", "hiring_manager")),
+    "hrbp": ("HRBP", "HRBP", ("hiring_manager", "reporting_manager")),
+    "buddy": ("Buddy", "Buddy", ("hrbp", "hiring_manager", "reporting_manager")),
+}
+
+# Reply when a name or number matches no candidate
+CANDIDATE_NOT_FOUND_TEMPLATE = (
+    "**❌ Candidate Not Found**\n\n"
+    "Could not find a candidate named '{name}'.\n\n"
+    "**Please try:**\n"
+    "• Type the full name\n"
+    "• Use a candidate number from the list\n"
+    "• Check spelling\n\n"
+    "{candidate_list}"
+)
+
+# Phrases that mark actions in a conversation summary (any one matches)
+_HM_INFO_PHRASES = ("hiring manager info", "hiring manager availability")
+_PROPOSALS_FOUND_PHRASES = ("available times", "proposals")
+_CANDIDATES_LISTED_PHRASES = ("candidates ready for onboarding", "candidates with", "candidates:")
+_DETAILS_VIEWED_PHRASES = ("candidate details", "candidate information")
+_MEETING_UPDATED_PHRASES = ("meeting type", "duration")
+
+def make_message(role: str, content: Any) -> Dict[str, Any]:
+    """Build a chat message, precomputing its lowercased content for keyword scans."""
+    if not isinstance(content, str):
+        content = str(content)
+    return {"role": role, "content": content, "content_lc": content.lower()}
+
+def message_text_lower(msg: Dict[str, Any]) -> str:
+    """Lowercased message content (computed here for messages saved without it)."""
+    content_lc = msg.get("content_lc")
+    if content_lc is None:
+        content_lc = msg.get("content", "").lower()
+    return content_lc
+
 def generate_conversation_title(messages: List[Dict[str, Any]]) -> str:
     """Generate an appropriate title for a conversation based on its content."""
     if not messages:
@@ -113,23 +337,27 @@ def generate_conversation_title(messages: List[Dict[str, Any]]) -> str:
     if st.session_state.get("selected_candidate"):
         candidate_name = st.session_state.selected_candidate.name
     
+    # One pattern matching any candidate name, only needed when no candidate is
+    # selected. A failed candidate fetch just leaves the title without a name.
+    name_pattern = None
+    if not candidate_name:
+        try:
+            name_pattern = get_candidate_name_pattern()
+        except Exception:
+            name_pattern = None
+    
     # Look through messages for candidate mentions and meeting types
     for msg in messages:
         content = msg.get("content", "")
         
-        # Check if content mentions a candidate name (try to get from global if available)
-        try:
-            if 'data_client' in globals() and data_client:
-                candidates = data_client.list_candidates()
-                for candidate in candidates:
-                    if candidate.name in content:
-                        candidate_name = candidate.name
-                        break
-        except:
-            pass
+        # Check if content mentions a candidate name
+        if name_pattern:
+            name_match = name_pattern.search(content)
+            if name_match:
+                candidate_name = name_match.group()
         
         # Check for meeting type mentions
-        content_lower = content.lower()
+        content_lower = message_text_lower(msg)
         if "hiring manager" in content_lower:
             meeting_type = "Hiring Manager"
         elif "reporting manager" in content_lower:
@@ -164,17 +392,40 @@ def generate_conversation_summary(messages: List[Dict[str, Any]], meeting_config
     if not messages:
         return "Empty conversation"
     
-    # Extract key information from messages and state
-    user_messages = [msg.get("content", "").lower() for msg in messages if msg.get("role") == "user"]
-    assistant_messages = [msg.get("content", "").lower() for msg in messages if msg.get("role") == "assistant"]
-    
-    all_text = " ".join(user_messages + assistant_messages)
-    
-    # Check for key actions (in priority order)
+    # Detect key actions in a single pass over the messages
+    booked = proposals_found = hm_info_checked = False
+    candidates_listed = details_viewed = meeting_configured = candidate_selected = False
+    for msg in messages:
+        role = msg.get("role")
+        if role != "user" and role != "assistant":
+            continue
+        content = message_text_lower(msg)
+        
+        # Checks for actions already detected are skipped on later messages
+        if not hm_info_checked and any(phrase in content for phrase in _HM_INFO_PHRASES):
+            hm_info_checked = True
+        if role == "user":
+            continue
+        
+        if "meeting booked" in content or ("✅" in content and "meeting" in content):
+            booked = True
+            break  # Highest priority - nothing else can change the summary
+        if not proposals_found and "found" in content and any(phrase in content for phrase in _PROPOSALS_FOUND_PHRASES):
+            proposals_found = True
+        if not candidates_listed and any(phrase in content for phrase in _CANDIDATES_LISTED_PHRASES):
+            candidates_listed = True
+        if not details_viewed and any(phrase in content for phrase in _DETAILS_VIEWED_PHRASES):
+            details_viewed = True
+        if not meeting_configured and "updated" in content and any(phrase in content for phrase in _MEETING_UPDATED_PHRASES):
+            meeting_configured = True
+        if not candidate_selected and "scheduling for" in content:
+            candidate_selected = True
+    
+    # Summarize the highest-priority action
     summary_parts = []
     
     # Check if meeting was booked
-    if any("meeting booked" in msg or ("✅" in msg and "meeting" in msg) for msg in assistant_messages):
+    if booked:
         duration = meeting_config.get("duration") if meeting_config else None
         meeting_type = meeting_config.get("type") if meeting_config else None
         if meeting_type:
@@ -187,25 +438,25 @@ def generate_conversation_summary(messages: List[Dict[str, Any]], meeting_config
             summary_parts.append("Meeting booked")
     
     # Check if proposals were generated
-    elif any("found" in msg and ("available times" in msg or "proposals" in msg) for msg in assistant_messages):
+    elif proposals_found:
         summary_parts.append("Found meeting times")
     
     # Check if hiring manager info was queried
-    elif any("hiring manager info" in msg or "hiring manager information" in msg or "hiring manager availability" in msg for msg in all_text):
+    elif hm_info_checked:
         summary_parts.append("Checked hiring manager availability")
     
         # Note: Recruiter info not available from Darwin API
     
     # Check if candidates were listed
-    elif any("candidates ready for onboarding" in msg or "candidates with" in msg or "candidates:" in msg for msg in assistant_messages):
+    elif candidates_listed:
         summary_parts.append("Listed candidates")
     
     # Check if candidate details were viewed
-    elif any("candidate details" in msg or "candidate information" in msg for msg in assistant_messages):
+    elif details_viewed:
         summary_parts.append("Viewed candidate details")
     
     # Check if meeting was configured
-    elif any("updated" in msg and ("meeting type" in msg or "duration" in msg) for msg in assistant_messages):
+    elif meeting_configured:
         duration = meeting_config.get("duration") if meeting_config else None
         meeting_type = meeting_config.get("type") if meeting_config else None
         if meeting_type and duration:
@@ -218,7 +469,7 @@ def generate_conversation_summary(messages: List[Dict[str, Any]], meeting_config
             summary_parts.append("Configured meeting")
     
     # Check if candidate was selected
-    elif any("got it! scheduling for" in msg or "scheduling for" in msg for msg in assistant_messages):
+    elif candidate_selected:
         summary_parts.append("Selected candidate")
     
     # Default fallback - use first meaningful user message
@@ -240,20 +491,87 @@ def format_candidate_summary(candidate) -> str:
     """Quick candidate summary (without redundant fields)."""
     return f"✓ **{candidate.name}**"
 
+def get_candidate_personas(candidate_id: str) -> Dict[str, Any]:
+    """Related personas for a candidate, cached per session for EMPLOYEE_CACHE_TTL_SECONDS."""
+    now = time.monotonic()
+    cached = st.session_state.persona_cache.get(candidate_id)
+    if cached is not None and now - cached[0] < EMPLOYEE_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    personas = data_client.get_related_personas_for_candidate(candidate_id)
+    st.session_state.persona_cache[candidate_id] = (now, personas)
+    return personas
+
 def format_candidate_details(candidate) -> str:
     """Format detailed candidate information using structured formatter."""
-    personas = data_client.get_related_personas_for_candidate(candidate.id)
+    personas = get_candidate_personas(candidate.id)
     return ResponseFormatter.format_candidate_details(candidate, personas)
 
 def format_proposals(proposals: List, candidate, show_all: bool = False) -> tuple[str, List[Dict[str, Any]]]:
     """Format meeting proposals using structured formatter."""
     return ResponseFormatter.format_proposals(proposals, candidate, show_all)
 
+def fast_intent(prompt: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Classify trivial prompts locally, without an OpenAI call.
+    
+    Handles confirmations, help, "list candidates", candidate counts and bare
+    candidate names. Returns None when the prompt needs the full parse.
+    """
+    text = prompt.strip().lower()
+    intent = None
+    candidate_name = None
+    count = None
+    
+    if _FAST_CONFIRM_RE.match(text):
+        # A confirmation only books something once proposals exist; before that,
+        # "go" asks for times (as smart_suggest_next_action suggests) and the
+        # rest need the full parse
+        if context.get('has_proposals') or context.get('awaiting_confirmation'):
+            intent = "confirm_booking"
+        elif text.rstrip(".!") == "go":
+            intent = "generate_proposals"
+        else:
+            return None
+    elif _FAST_HELP_RE.match(text):
+        intent = "help"
+    elif _FAST_LIST_RE.match(text):
+        intent = "list_candidates"
+    else:
+        count_match = _FAST_COUNT_RE.match(text)
+        # Only "N candidates" is unambiguous; a bare number may pick a candidate from
+        # the list or give a duration, so it is left to the model, which sees the conversation
+        if count_match:
+            intent = "list_candidates"
+            count = int(count_match.group(1))
+        else:
+            exact_index, _ = get_candidate_name_index()
+            if text in exact_index:
+                intent = "select_candidate"
+                candidate_name = exact_index[text][1]
+    
+    if intent is None:
+        return None
+    return {
+        "intent": intent,
+        "candidate_name": candidate_name,
+        "meeting_type": None,
+        "duration": None,
+        "count": count,
+        "wants_proposals": False,
+        "show_all": False,
+        "confidence": 1.0
+    }
+
 def parse_intent_with_openai(prompt: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Enhanced OpenAI intent parsing with better context awareness."""
     if not prompt:
         return None
     
+    local_intent = fast_intent(prompt, context)
+    if local_intent:
+        return local_intent
+    
     try:
         context_str = f"""Current state:
 - Selected candidate: {context.get('selected_candidate_name', 'None')}
@@ -272,94 +590,81 @@ def parse_intent_with_openai(prompt: str, context: Dict[str, Any]) -> Optional[D
                 content = msg.get('content', '')[:200]
                 conversation_history += f"{role}: {content}\n"
         
-        system_prompt = """You are an intelligent meeting scheduling assistant. Parse user queries naturally and extract structured information.
-
-Available meeting types (return EXACTLY as shown):
-- "Intro with Hiring Manager"
-- "Intro with Reporting Manager"
-- "Intro with HRBP"
-- "Intro with Buddy"
-
-IMPORTANT: "Intro with Recruiter" is NOT available - Darwin API does not provide recruiter information.
-
-Available intents:
-- list_candidates: Show available candidates from Darwin API (MUST extract count if user specifies a number)
-- list_candidates_with_hiring_managers: List candidates showing hiring manager availability (whose hiring manager info is available, who has hiring manager info, which candidates have hiring manager, etc.)
-- select_candidate: Choose a candidate (extract name if mentioned)
-- view_candidate_details: Show detailed information about a candidate (info, details, about, who is)
-- configure_meeting: Set up meeting details
-- set_duration: Specify meeting duration
-- generate_proposals: Find available meeting times
-- confirm_booking: User confirms they want to book (yes, confirm, book it, etc)
-- send_invites: Send meeting invitations
-- view_email: Show email content
-- start_over: Restart the process
-- help: User needs assistance
-
-IMPORTANT PARSING RULES:
-1. COUNT EXTRACTION IS CRITICAL: If user says "show me 10 candidates" or "list 5 candidates" or "10 candidates", you MUST:
-   - Set intent: "list_candidates"
-   - Set count: the number they specified (10, 5, etc.)
-   - Examples: "show me 10" → count=10, "list 20 candidates" → count=20, "10 people" → count=10
-2. If user says "choose [name] and [action]", extract name AND set intent to the action
-3. For "30 min with hiring manager" → extract both duration and type
-4. "yes", "confirm", "book it", "send it" → intent: confirm_booking
-5. Handle typos intelligently (hring→hiring, manaegr→manager)
-6. "show me more candidates" or "show more candidates" → intent: list_candidates (increment offset, keep current count)
-6a. "show me more", "other options" (for proposals) → intent: generate_proposals with show_all: true
-7. Recognize complete requests: "Schedule John Smith for 45 min hiring manager meeting" should extract ALL info
-8. IMPORTANT: Recruiter information is NOT available from Darwin API - NEVER set meeting_type to "Intro with Recruiter"
-9. Queries about "whose hiring manager", "who has hiring manager", "hiring manager info available", "which candidates have hiring manager" → intent: list_candidates_with_hiring_managers
-10. If user asks about recruiter, politely inform them that recruiter information is not available from Darwin API
-
-Return JSON with:
-{
-    "intent": "primary_intent",
-    "candidate_name": "extracted name or null",
-    "meeting_type": "meeting type or null",
-    "duration": number or null,
-    "count": number or null,
-    "wants_proposals": true/false,
-    "show_all": true/false,
-    "confidence": 0.0-1.0
-}
-
-CRITICAL COUNT EXTRACTION RULES (MUST FOLLOW):
-1. If user says "show me 10 candidates" → MUST return: {"intent": "list_candidates", "count": 10}
-2. If user says "list 5 candidates" → MUST return: {"intent": "list_candidates", "count": 5}
-3. If user says "10 candidates" → MUST return: {"intent": "list_candidates", "count": 10}
-4. If user says "show me 20" → MUST return: {"intent": "list_candidates", "count": 20}
-5. If user says "list candidates" (no number) → return: {"intent": "list_candidates", "count": null}
-6. ALWAYS extract the number when present - look for patterns like:
-   - "show me X"
-   - "list X"
-   - "X candidates"
-   - "X people"
-   - Just "X" when context is about listing candidates
-7. The count field MUST be a number (integer), not a string. If no number found, use null."""
-
         user_prompt = f"""{context_str}{conversation_history}
 
 User query: "{prompt}"
 
 Parse and return ONLY valid JSON."""
 
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.1,
-            response_format={"type": "json_object"}
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return result
+        # Pending confirmations must always be re-parsed, never served from cache
+        if context.get('awaiting_confirmation', False):
+            return request_intent_from_openai(user_prompt)
+        return cached_intent_from_openai(user_prompt)
         
     except Exception as e:
         return None
 
+def request_intent_from_openai(user_prompt: str) -> Dict[str, Any]:
+    """Send one intent-parsing request to OpenAI and return the parsed JSON."""
+    response = openai_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": INTENT_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.1,
+        max_tokens=INTENT_MAX_TOKENS,
+        response_format={"type": "json_object"}
+    )
+    
+    return json.loads(response.choices[0].message.content)
+
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def cached_intent_from_openai(user_prompt: str) -> Dict[str, Any]:
+    """
+    Intent parse memoized on the full user prompt (cached).
+    
+    The user prompt already contains the state summary, recent conversation and
+    query, so identical prompts are identical requests. Failures raise and are
+    not cached.
+    """
+    return request_intent_from_openai(user_prompt)
+
+@st.cache_resource(ttl=600)
+def get_candidate_name_index() -> tuple[Dict[str, tuple[int, str]], List[tuple[str, str]]]:
+    """
+    Index candidate names for prompt matching (cached).
+    
+    Returns:
+        (lowercase name -> (list position, name) of the first candidate with that name,
+         (name, lowercase name) for every candidate in list order)
+    """
+    names = [
+        (candidate.name, candidate.name_lc)
+        for candidate in get_candidates()
+    ]
+    exact_index: Dict[str, tuple[int, str]] = {}
+    for position, (name, name_lower) in enumerate(names):
+        exact_index.setdefault(name_lower, (position, name))
+    return exact_index, names
+
+@st.cache_resource(ttl=600)
+def get_candidate_name_pattern() -> Optional[re.Pattern]:
+    """Compile one alternation matching any candidate name, longest names first (cached)."""
+    _, candidate_names = get_candidate_name_index()
+    names = sorted({name for name, _ in candidate_names if name}, key=len, reverse=True)
+    if not names:
+        return None
+    return re.compile("|".join(re.escape(name) for name in names))
+
+@st.cache_resource(ttl=600)
+def get_candidates_by_name() -> Dict[str, Candidate]:
+    """Map each normalized candidate name to the first candidate with that name (cached)."""
+    candidates_by_name = {}
+    for candidate in get_candidates():
+        candidates_by_name.setdefault(candidate.name_lc, candidate)
+    return candidates_by_name
+
 def auto_extract_all_info(prompt: str) -> Dict[str, Any]:
     """Extract all possible info from a single message."""
     info = {
@@ -369,77 +674,63 @@ def auto_extract_all_info(prompt: str) -> Dict[str, Any]:
     }
     
     # Extract candidate name with improved matching
-    candidates = data_client.list_candidates()
+    exact_index, candidate_names = get_candidate_name_index()
     prompt_lower = prompt.lower().strip()
     
     # Handle possessive queries like "john doe's manager" or "his manager"
     # Extract name before apostrophe or possessive words
-    possessive_patterns = [
-        r"(\w+(?:\s+\w+)*)\s*'s\s+",  # "john doe's"
-    ]
-    
     extracted_name = None
-    for pattern in possessive_patterns:
-        match = re.search(pattern, prompt_lower)
-        if match:
-            extracted_name = match.group(1).strip()
-            break
+    match = _POSSESSIVE_RE.search(prompt_lower)
+    if match:
+        extracted_name = match.group(1).strip()
     
     # Handle "setup [candidate] with [person]" pattern
     # Extract candidate name before "with"
-    with_pattern = re.search(r"(?:setup|schedule|meet|call)\s+(\w+(?:\s+\w+)*)\s+with", prompt_lower)
+    with_pattern = _WITH_RE.search(prompt_lower)
     if with_pattern:
         potential_candidate = with_pattern.group(1).strip()
         # Verify it's actually a candidate name
-        for candidate in candidates:
-            if potential_candidate.lower() in candidate.name.lower() or candidate.name.lower() in potential_candidate.lower():
-                extracted_name = candidate.name
+        for name, name_lower in candidate_names:
+            if potential_candidate in name_lower or name_lower in potential_candidate:
+                extracted_name = name
                 break
     
-    # Try exact match first
-    for candidate in candidates:
-        candidate_name_lower = candidate.name.lower().strip()
-        if candidate_name_lower == prompt_lower or (extracted_name and candidate_name_lower == extracted_name):
-            info["candidate_name"] = candidate.name
-            break
+    # Try exact match first (earliest candidate matching the prompt or the extracted name)
+    exact_matches = [
+        exact_index[key] for key in (prompt_lower, extracted_name)
+        if key and key in exact_index
+    ]
+    if exact_matches:
+        info["candidate_name"] = min(exact_matches)[1]
     
     # Try substring match (candidate name in prompt or prompt in candidate name)
     if not info["candidate_name"]:
         search_text = extracted_name if extracted_name else prompt_lower
-        for candidate in candidates:
-            candidate_name_lower = candidate.name.lower().strip()
+        search_words = set(search_text.split())
+        long_search_words = [word for word in search_words if len(word) > 2]
+        for name, name_lower in candidate_names:
             # Check if full candidate name appears in prompt
-            if candidate_name_lower in search_text or search_text in candidate_name_lower:
-                info["candidate_name"] = candidate.name
+            if name_lower in search_text or search_text in name_lower:
+                info["candidate_name"] = name
                 break
-            # Check if prompt words match candidate name parts
-            search_words = set(search_text.split())
             # If all search words are in candidate name (for partial matches like "john" matching "John Doe")
-            if search_words and all(word in candidate_name_lower for word in search_words if len(word) > 2):
-                info["candidate_name"] = candidate.name
+            if search_words and all(word in name_lower for word in long_search_words):
+                info["candidate_name"] = name
                 break
     
-    # Extract meeting type (only Darwin API supported types)
-    type_mapping = {
-        "hiring manager": "Intro with Hiring Manager",
-        "hiring": "Intro with Hiring Manager",
-        "reporting manager": "Intro with Reporting Manager",
-        "reporting": "Intro with Reporting Manager",
-        "hrbp": "Intro with HRBP",
-        "hr bp": "Intro with HRBP",
-        "buddy": "Intro with Buddy"
-    }
-    
     prompt_lower = prompt.lower()
     
-    # Check for meeting types (recruiter is NOT available from Darwin API)
-    for key, value in type_mapping.items():
-        if key in prompt_lower:
-            info["meeting_type"] = value
-            break
+    # Extract meeting type: one scan, then the highest-priority keyword found
+    # (recruiter is NOT available from Darwin API)
+    found_keywords = set(_MEETING_TYPE_RE.findall(prompt_lower))
+    if found_keywords:
+        for keyword, meeting_type in _MEETING_TYPE_KEYWORDS:
+            if keyword in found_keywords:
+                info["meeting_type"] = meeting_type
+                break
     
     # Extract duration
-    duration_match = re.search(r'(\d+)\s*(?:min|minutes|minute)', prompt_lower)
+    duration_match = _DURATION_RE.search(prompt_lower)
     if duration_match:
         info["duration"] = int(duration_match.group(1))
     
@@ -447,21 +738,21 @@ def auto_extract_all_info(prompt: str) -> Dict[str, Any]:
 
 def is_ready_to_generate_proposals() -> bool:
     """Check if we have all info needed to generate proposals."""
-    return (
-        st.session_state.selected_candidate is not None and
-        st.session_state.meeting_config.get("type") is not None and
-        st.session_state.meeting_config.get("duration") is not None
-    )
+    if st.session_state.selected_candidate is None:
+        return False
+    meeting_config = st.session_state.meeting_config
+    return meeting_config.get("type") is not None and meeting_config.get("duration") is not None
 
 def smart_suggest_next_action() -> Optional[str]:
     """Intelligently suggest what the user should do next."""
     if not st.session_state.selected_candidate:
         return "💡 *Try: 'Show me candidates' or just type a candidate's name*"
     
-    if not st.session_state.meeting_config.get("type"):
+    meeting_config = st.session_state.meeting_config
+    if not meeting_config.get("type"):
         return "💡 *Try: 'Set up hiring manager meeting' or '30 min with HRBP'*"
     
-    if not st.session_state.meeting_config.get("duration"):
+    if not meeting_config.get("duration"):
         return "💡 *Try: '30 minutes' or '45 min'*"
     
     if not st.session_state.proposals:
@@ -469,13 +760,52 @@ def smart_suggest_next_action() -> Optional[str]:
     
     return None
 
+def resolve_candidate(candidate_name: str, candidates: tuple) -> Optional[Candidate]:
+    """
+    Find the candidate a user meant by name or list number.
+    
+    Tries, in order: exact name, substring either way, all words of 3+ letters
+    found in the name (for partial names like "john" matching "John Doe"), and
+    finally a 1-based position in the list.
+    """
+    candidate_name_lower = candidate_name.lower().strip()
+    
+    candidate = get_candidates_by_name().get(candidate_name_lower)
+    if candidate:
+        return candidate
+    
+    for cand in candidates:
+        cand_name_lower = cand.name_lc
+        if candidate_name_lower in cand_name_lower or cand_name_lower in candidate_name_lower:
+            return cand
+    
+    candidate_name_words = set(candidate_name_lower.split())
+    if candidate_name_words:
+        long_words = [word for word in candidate_name_words if len(word) > 2]
+        # A name missing any character of the words can't contain them all
+        words_mask = char_mask("".join(long_words))
+        for cand in candidates:
+            if words_mask & ~cand.name_mask:
+                continue
+            cand_name_lower = cand.name_lc
+            if all(word in cand_name_lower for word in long_words):
+                return cand
+    
+    try:
+        num = int(candidate_name)
+    except ValueError:
+        return None
+    if 1 <= num <= len(candidates):
+        return candidates[num - 1]
+    return None
+
 # ============================================================================
 # INTENT HANDLERS - Streamlined
 # ============================================================================
 
 def handle_list_candidates(count: Optional[int] = None, offset: Optional[int] = None, reset_offset: bool = False) -> str:
     """Show candidates with structured response and pagination support."""
-    candidates = data_client.list_candidates()
+    candidates = get_candidates()
     
     # Handle offset
     if reset_offset:
@@ -526,111 +856,36 @@ def handle_list_candidates_with_recruiters() -> str:
 
 def handle_list_candidates_with_hiring_managers() -> str:
     """List candidates with structured response showing hiring manager availability."""
-    candidates = data_client.list_candidates()
-    return ResponseFormatter.format_personas_list(candidates, "hiring_manager")
+    candidates = get_candidates()
+    return ResponseFormatter.format_personas_list(candidates, "hiring_manager", data_client=data_client)
 
 def handle_view_candidate_details(candidate_name: str = None) -> str:
     """Show detailed information about a candidate."""
     # Determine which candidate to show
     candidate = None
+    candidates = get_candidates()
     
     if candidate_name:
-        # Try to find candidate by name with improved matching
-        candidates = data_client.list_candidates()
-        candidate_name_lower = candidate_name.lower().strip()
-        
-        # Try exact match first
-        for cand in candidates:
-            if cand.name.lower().strip() == candidate_name_lower:
-                candidate = cand
-                break
-        
-        # Try substring match
-        if not candidate:
-            for cand in candidates:
-                cand_name_lower = cand.name.lower().strip()
-                if candidate_name_lower in cand_name_lower or cand_name_lower in candidate_name_lower:
-                    candidate = cand
-                    break
-        
-        # Try word-based matching (for partial names like "john" matching "John Doe")
-        if not candidate:
-            candidate_name_words = set(candidate_name_lower.split())
-            for cand in candidates:
-                cand_name_lower = cand.name.lower().strip()
-                cand_words = set(cand_name_lower.split())
-                # If all words in candidate_name are found in candidate's name
-                if candidate_name_words and all(word in cand_name_lower for word in candidate_name_words if len(word) > 2):
-                    candidate = cand
-                    break
-        
-        # Try by number
-        if not candidate:
-            try:
-                num = int(candidate_name)
-                if 1 <= num <= len(candidates):
-                    candidate = candidates[num - 1]
-            except ValueError:
-                pass
+        candidate = resolve_candidate(candidate_name, candidates)
     elif st.session_state.selected_candidate:
         # Use currently selected candidate
         candidate = st.session_state.selected_candidate
     
     if not candidate:
-        candidates = data_client.list_candidates()
         return f"🤔 I couldn't find a candidate named '{candidate_name}'. Could you try again?\n\n{ResponseFormatter.format_candidate_list(candidates, limit=10, data_client=data_client)}"
     
     return format_candidate_details(candidate)
 
 def handle_select_candidate(candidate_name: str, ai_intent: Dict[str, Any]) -> str:
     """Select candidate and auto-progress if more info provided."""
-    candidates = data_client.list_candidates()
-    
-    # Try to find candidate with improved matching
-    candidate = None
-    candidate_name_lower = candidate_name.lower().strip()
-    
-    # Try exact match first
-    for cand in candidates:
-        if cand.name.lower().strip() == candidate_name_lower:
-            candidate = cand
-            break
-    
-    # Try substring match
-    if not candidate:
-        for cand in candidates:
-            cand_name_lower = cand.name.lower().strip()
-            if candidate_name_lower in cand_name_lower or cand_name_lower in candidate_name_lower:
-                candidate = cand
-                break
+    candidates = get_candidates()
     
-    # Try word-based matching
-    if not candidate:
-        candidate_name_words = set(candidate_name_lower.split())
-        for cand in candidates:
-            cand_name_lower = cand.name.lower().strip()
-            if candidate_name_words and all(word in cand_name_lower for word in candidate_name_words if len(word) > 2):
-                candidate = cand
-                break
+    candidate = resolve_candidate(candidate_name, candidates)
     
-    # Try by number
     if not candidate:
-        try:
-            num = int(candidate_name)
-            if 1 <= num <= len(candidates):
-                candidate = candidates[num - 1]
-        except ValueError:
-            pass
-    
-    if not candidate:
-        return (
-            f"**❌ Candidate Not Found**\n\n"
-            f"Could not find a candidate named '{candidate_name}'.\n\n"
-            f"**Please try:**\n"
-            f"• Type the full name\n"
-            f"• Use a candidate number from the list\n"
-            f"• Check spelling\n\n"
-            f"{ResponseFormatter.format_candidate_list(candidates, limit=10, data_client=data_client)}"
+        return CANDIDATE_NOT_FOUND_TEMPLATE.format(
+            name=candidate_name,
+            candidate_list=ResponseFormatter.format_candidate_list(candidates, limit=10, data_client=data_client)
         )
     
     # Select candidate
@@ -687,63 +942,29 @@ def handle_select_candidate(candidate_name: str, ai_intent: Dict[str, Any]) -> s
 
 def handle_configure_meeting(ai_intent: Dict[str, Any], prompt: str = "") -> str:
     """Configure meeting with smart extraction."""
-    # Extract all info from prompt if available
-    extracted_info = auto_extract_all_info(prompt) if prompt else {}
+    # Extract all info from prompt if available (and the AI intent left a field
+    # unset); values set by the AI intent win
+    needs_extraction = prompt and not (
+        ai_intent and all(ai_intent.get(key) for key in ("candidate_name", "meeting_type", "duration"))
+    )
+    info = auto_extract_all_info(prompt) if needs_extraction else {}
+    if ai_intent:
+        info.update((key, value) for key, value in ai_intent.items() if value)
     
     # First, try to extract and select candidate if mentioned in the query
-    candidate_name = ai_intent.get("candidate_name") if ai_intent else None
-    if not candidate_name:
-        candidate_name = extracted_info.get("candidate_name")
+    candidate_name = info.get("candidate_name")
     
     # If candidate name found but not selected, select it first
     if candidate_name and not st.session_state.selected_candidate:
-        candidates = data_client.list_candidates()
-        candidate = None
-        candidate_name_lower = candidate_name.lower().strip()
-        
-        # Try exact match first
-        for cand in candidates:
-            if cand.name.lower().strip() == candidate_name_lower:
-                candidate = cand
-                break
-        
-        # Try substring match
-        if not candidate:
-            for cand in candidates:
-                cand_name_lower = cand.name.lower().strip()
-                if candidate_name_lower in cand_name_lower or cand_name_lower in candidate_name_lower:
-                    candidate = cand
-                    break
-        
-        # Try word-based matching
-        if not candidate:
-            candidate_name_words = set(candidate_name_lower.split())
-            for cand in candidates:
-                cand_name_lower = cand.name.lower().strip()
-                if candidate_name_words and all(word in cand_name_lower for word in candidate_name_words if len(word) > 2):
-                    candidate = cand
-                    break
-        
-        # Try by number if not found by name
-        if not candidate:
-            try:
-                num = int(candidate_name)
-                if 1 <= num <= len(candidates):
-                    candidate = candidates[num - 1]
-            except ValueError:
-                pass
+        candidates = get_candidates()
+        candidate = resolve_candidate(candidate_name, candidates)
         
         if candidate:
             st.session_state.selected_candidate = candidate
         else:
-            return (
-                f"**❌ Candidate Not Found**\n\n"
-                f"Could not find a candidate named '{candidate_name}'.\n\n"
-                f"**Please try:**\n"
-                f"• Type the full name\n"
-                f"• Use a candidate number from the list\n"
-                f"• Check spelling\n\n"
-                f"{format_candidate_list(candidates)}"
+            return CANDIDATE_NOT_FOUND_TEMPLATE.format(
+                name=candidate_name,
+                candidate_list=ResponseFormatter.format_candidate_list(candidates, limit=10, data_client=data_client)
             )
     
     # If still no candidate selected, ask for it
@@ -757,14 +978,9 @@ def handle_configure_meeting(ai_intent: Dict[str, Any], prompt: str = "") -> str
             "• Use a candidate number from the list"
         )
     
-    # Extract meeting type and duration from AI intent or prompt
-    meeting_type = ai_intent.get("meeting_type") if ai_intent else None
-    if not meeting_type:
-        meeting_type = extracted_info.get("meeting_type")
-    
-    duration = ai_intent.get("duration") if ai_intent else None
-    if not duration:
-        duration = extracted_info.get("duration")
+    # Meeting type and duration from AI intent or prompt
+    meeting_type = info.get("meeting_type")
+    duration = info.get("duration")
     
     # Build structured response
     candidate = st.session_state.selected_candidate
@@ -814,6 +1030,24 @@ def handle_configure_meeting(ai_intent: Dict[str, Any], prompt: str = "") -> str
     
     return "\n".join(lines)
 
+def _persona_missing_error(candidate, persona_key: str, personas: Dict[str, Any]) -> str:
+    """Explain that the persona a meeting type needs is missing, listing the alternatives."""
+    title, label, alternatives = _PERSONAS[persona_key]
+    available = "".join(
+        f"• {_PERSONAS[key][0]}: {'✅ Available' if key in personas else '❌ Not available'}\n"
+        for key in alternatives
+    )
+    data_hint = "buddy data is configured" if persona_key == "buddy" else "manager data is configured in Darwin API"
+    return (
+        f"**❌ {title} Not Available**\n\n"
+        f"{label} information is not available for **{candidate.name}**.\n\n"
+        f"**Available from Darwin API:**\n"
+        f"{available}\n"
+        f"**Please:**\n"
+        f"• Use a different meeting type\n"
+        f"• Or ensure {data_hint}"
+    )
+
 def handle_generate_proposals(show_all: bool = False) -> str:
     """Generate and display proposals with structured response."""
     candidate = st.session_state.selected_candidate
@@ -839,68 +1073,24 @@ def handle_generate_proposals(show_all: bool = False) -> str:
         )
     
     # Get participants
-    personas = data_client.get_related_personas_for_candidate(candidate.id)
+    personas = get_candidate_personas(candidate.id)
     participant_ids = [candidate.id]
     
     # Check if we have the required persona for the meeting type
-    if "hiring" in meeting_type.lower():
-        if "hiring_manager" in personas:
-            participant_ids.append(personas["hiring_manager"].id)
-        else:
-            return (
-                f"**❌ Hiring Manager Not Available**\n\n"
-                f"Hiring manager information is not available for **{candidate.name}**.\n\n"
-                f"**Available from Darwin API:**\n"
-                f"• HRBP: {'✅ Available' if 'hrbp' in personas else '❌ Not available'}\n"
-                f"• Reporting Manager: {'✅ Available' if 'reporting_manager' in personas else '❌ Not available'}\n\n"
-                f"**Please:**\n"
-                f"• Use a different meeting type\n"
-                f"• Or ensure manager data is configured in Darwin API"
-            )
-    elif "reporting" in meeting_type.lower():
-        if "reporting_manager" in personas:
-            participant_ids.append(personas["reporting_manager"].id)
-        else:
-            return (
-                f"**❌ Reporting Manager Not Available**\n\n"
-                f"Reporting manager information is not available for **{candidate.name}**.\n\n"
-                f"**Available from Darwin API:**\n"
-                f"• HRBP: {'✅ Available' if 'hrbp' in personas else '❌ Not available'}\n"
-                f"• Hiring Manager: {'✅ Available' if 'hiring_manager' in personas else '❌ Not available'}\n\n"
-                f"**Please:**\n"
-                f"• Use a different meeting type\n"
-                f"• Or ensure manager data is configured in Darwin API"
-            )
-    elif "hrbp" in meeting_type.lower():
-        if "hrbp" in personas:
-            participant_ids.append(personas["hrbp"].id)
-        else:
-            return (
-                f"**❌ HRBP Not Available**\n\n"
-                f"HRBP information is not available for **{candidate.name}**.\n\n"
-                f"**Available from Darwin API:**\n"
-                f"• Hiring Manager: {'✅ Available' if 'hiring_manager' in personas else '❌ Not available'}\n"
-                f"• Reporting Manager: {'✅ Available' if 'reporting_manager' in personas else '❌ Not available'}\n\n"
-                f"**Please:**\n"
-                f"• Use a different meeting type\n"
-                f"• Or ensure manager data is configured in Darwin API"
-            )
-    elif "buddy" in meeting_type.lower():
-        if "buddy" in personas:
-            participant_ids.append(personas["buddy"].id)
+    persona_key = None
+    found_keywords = set(_MEETING_TYPE_PERSONA_RE.findall(meeting_type.lower()))
+    if found_keywords:
+        for keyword, key in _MEETING_TYPE_PERSONAS:
+            if keyword in found_keywords:
+                persona_key = key
+                break
+    
+    if persona_key in _PERSONAS:
+        if persona_key in personas:
+            participant_ids.append(personas[persona_key].id)
         else:
-            return (
-                f"**❌ Buddy Not Available**\n\n"
-                f"Buddy information is not available for **{candidate.name}**.\n\n"
-                f"**Available from Darwin API:**\n"
-                f"• HRBP: {'✅ Available' if 'hrbp' in personas else '❌ Not available'}\n"
-                f"• Hiring Manager: {'✅ Available' if 'hiring_manager' in personas else '❌ Not available'}\n"
-                f"• Reporting Manager: {'✅ Available' if 'reporting_manager' in personas else '❌ Not available'}\n\n"
-                f"**Please:**\n"
-                f"• Use a different meeting type\n"
-                f"• Or ensure buddy data is configured"
-            )
-    elif "recruiter" in meeting_type.lower():
+            return _persona_missing_error(candidate, persona_key, personas)
+    elif persona_key == "recruiter":
         return ResponseFormatter.format_error(
             "Recruiter Not Available",
             "Recruiter information is not available from Darwin API.",
@@ -932,7 +1122,7 @@ def handle_generate_proposals(show_all: bool = False) -> str:
     
     meeting_request = MeetingRequest(
         candidate_id=candidate.id,
-        participants=participant_ids,
+        participants=tuple(participant_ids),
         duration_minutes=duration,
         deadline_date=end_date,
         meeting_type=meeting_type
@@ -981,8 +1171,7 @@ def handle_confirm_booking(proposal_index: int = 0) -> str:
     )
     
     slot = proposal.time_slot
-    candidate_tz = pytz.timezone(candidate.location_timezone)
-    candidate_local = slot.start.astimezone(candidate_tz)
+    candidate_local = slot.start.astimezone(candidate.tz)
     
     response = f"✅ **Meeting booked!**\n\n"
     response += f"📅 {candidate_local.strftime('%A, %B %d at %I:%M %p %Z')}\n"
@@ -1009,7 +1198,8 @@ def handle_view_email() -> str:
     response = "📧 **Latest Email Content:**\n\n"
     response += f"**To:** {', '.join(latest_email.get('to', []))}\n\n"
     response += f"**Subject:** {latest_email.get('subject', 'N/A')}\n\n"
-    response += f"**Sent At:** {latest_email.get('sent_at', datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
+    sent_at = latest_email.get('sent_at') or datetime.now(timezone.utc)
+    response += f"**Sent At:** {sent_at.strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
     response += "**Email Body:**\n\n"
     response += "```\n"
     response += latest_email.get('body', '')
@@ -1033,9 +1223,127 @@ def handle_start_over() -> str:
     st.session_state.awaiting_confirmation = False
     # Reset session start time for new session
     st.session_state.session_start_time = datetime.now()
+    # Pick up candidates and persona data changed since they were cached
+    clear_candidate_caches()
+    st.session_state.persona_cache = {}
     
     return "✨ Starting fresh! Who would you like to schedule a meeting for?"
 
+# ============================================================================
+# INTENT ROUTING
+# ============================================================================
+# Each route takes (prompt, ai_intent, extracted_info) and returns the response
+
+def _route_list_candidates(prompt: str, ai_intent: Optional[Dict[str, Any]], extracted_info: Dict[str, Any]) -> str:
+    """List candidates, honouring a requested count and "show more" paging."""
+    prompt_lower = prompt.lower()
+    
+    # Check if this is a "show more" request
+    is_show_more = any(phrase in prompt_lower for phrase in _SHOW_MORE_PHRASES)
+    
+    # Extract count from AI intent first (most reliable)
+    count = None
+    reset_offset = False
+    
+    if ai_intent and "count" in ai_intent:
+        count_value = ai_intent.get("count")
+        if count_value is not None:
+            try:
+                count = int(count_value)
+                reset_offset = True
+            except (ValueError, TypeError):
+                count = None
+    
+    # Fallback: Extract from prompt directly
+    if not count or count <= 0:
+        for pattern in _COUNT_PATTERNS:
+            match = pattern.search(prompt_lower)
+            if match:
+                try:
+                    count = int(match.group(1))
+                    if count > 0:
+                        reset_offset = True
+                        break
+                except (ValueError, IndexError):
+                    continue
+    
+    if is_show_more and not reset_offset:
+        return handle_list_candidates(count=count or 10, reset_offset=False)
+    return handle_list_candidates(count=count, reset_offset=reset_offset or True)
+
+def _route_select_candidate(prompt: str, ai_intent: Optional[Dict[str, Any]], extracted_info: Dict[str, Any]) -> str:
+    """Select the named candidate (the whole prompt when no name was parsed)."""
+    candidate_name = ai_intent.get("candidate_name") if ai_intent else extracted_info["candidate_name"]
+    if not candidate_name:
+        candidate_name = prompt
+    return handle_select_candidate(candidate_name, ai_intent)
+
+def _route_generate_proposals(prompt: str, ai_intent: Optional[Dict[str, Any]], extracted_info: Dict[str, Any]) -> str:
+    """Find meeting times, showing every option if the user asked for all."""
+    show_all = ai_intent.get("show_all", False) if ai_intent else False
+    return handle_generate_proposals(show_all=show_all)
+
+def _route_invalid_option(prompt: str, ai_intent: Optional[Dict[str, Any]], extracted_info: Dict[str, Any]) -> str:
+    """Reject an option number outside the current proposals."""
+    proposals = st.session_state.get("proposals", [])
+    return f"❌ Invalid option. Please select an option between 1 and {len(proposals)}."
+
+def _route_confirm_booking(prompt: str, ai_intent: Optional[Dict[str, Any]], extracted_info: Dict[str, Any]) -> str:
+    """Book the pending proposal (the best match unless an option was chosen)."""
+    # Get proposal index from session state (set by option parsing or defaults to 0 for best match)
+    proposal_index = st.session_state.pending_proposal_index
+    if proposal_index is None:
+        proposal_index = 0  # Default to best match if not specified
+    # Validate proposal index
+    proposals = st.session_state.get("proposals", [])
+    if not proposals:
+        return "❌ No proposals available. Please generate proposals first."
+    if proposal_index < 0 or proposal_index >= len(proposals):
+        return f"❌ Invalid option. Please select an option between 1 and {len(proposals)}."
+    return handle_confirm_booking(proposal_index)
+
+def _route_view_candidate_details(prompt: str, ai_intent: Optional[Dict[str, Any]], extracted_info: Dict[str, Any]) -> str:
+    """Show details for the named, selected, or prompt-mentioned candidate."""
+    candidate_name = ai_intent.get("candidate_name") if ai_intent else extracted_info.get("candidate_name")
+    # Don't pass None as candidate_name - use selected candidate or extract from context
+    if not candidate_name and st.session_state.selected_candidate:
+        candidate_name = None  # Will use selected candidate
+    elif not candidate_name:
+        # Try to extract from prompt if it mentions a specific name
+        prompt_lower = prompt.lower()
+        for cand in get_candidates():
+            if cand.name_lc in prompt_lower or prompt_lower in cand.name_lc:
+                candidate_name = cand.name
+                break
+    return handle_view_candidate_details(candidate_name)
+
+def _route_fallback(prompt: str, ai_intent: Optional[Dict[str, Any]], extracted_info: Dict[str, Any]) -> str:
+    """Smart fallback for unrecognized intents."""
+    if st.session_state.awaiting_confirmation:
+        return "Not sure what you mean. Say 'yes' to book the meeting, or 'show more' for other times."
+    if not st.session_state.selected_candidate:
+        return "I'm here to help schedule meetings! Try saying 'show candidates' or just type a candidate's name."
+    response = "I'm not quite sure what you'd like to do. "
+    suggestion = smart_suggest_next_action()
+    if suggestion:
+        response += f"\n\n{suggestion}"
+    return response
+
+# Intent -> route, looked up once per turn (unknown intents use _route_fallback)
+INTENT_HANDLERS: Dict[str, Callable[[str, Optional[Dict[str, Any]], Dict[str, Any]], str]] = {
+    "list_candidates": _route_list_candidates,
+    "list_candidates_with_recruiters": lambda *_: handle_list_candidates_with_recruiters(),
+    "list_candidates_with_hiring_managers": lambda *_: handle_list_candidates_with_hiring_managers(),
+    "select_candidate": _route_select_candidate,
+    "configure_meeting": lambda prompt, ai_intent, _: handle_configure_meeting(ai_intent, prompt),
+    "generate_proposals": _route_generate_proposals,
+    "invalid_option": _route_invalid_option,
+    "confirm_booking": _route_confirm_booking,
+    "view_email": lambda *_: handle_view_email(),
+    "view_candidate_details": _route_view_candidate_details,
+    "start_over": lambda *_: handle_start_over(),
+}
+
 # Initialize services using Darwin API (no configuration needed)
 data_client, calendar_service, scheduling_engine, email_service = get_services()
 
@@ -1048,7 +1356,13 @@ if data_client is None:
 # ============================================================================
 
 def save_current_conversation_to_history():
-    """Save current conversation with state to history."""
+    """
+    Save current conversation with state to history.
+    
+    The message list is moved into the history entry rather than copied, and the
+    session starts a new empty list; callers replace the messages right after
+    saving anyway (restore or reset).
+    """
     if st.session_state.messages:
         conversation_title = generate_conversation_title(st.session_state.messages)
         conversation_summary = generate_conversation_summary(
@@ -1064,7 +1378,8 @@ def save_current_conversation_to_history():
         conversation_entry = {
             "title": conversation_title,
             "summary": conversation_summary,
-            "messages": st.session_state.messages.copy(),
+            "messages": st.session_state.messages,
+            "fingerprint": conversation_fingerprint(st.session_state.messages),
             "state": {
                 "candidate_id": candidate_id,
                 "meeting_config": st.session_state.meeting_config.copy(),
@@ -1072,7 +1387,9 @@ def save_current_conversation_to_history():
                 # They will be regenerated if needed
             }
         }
+        entry_id(conversation_entry)
         st.session_state.chat_history.append(conversation_entry)
+        st.session_state.messages = []
 
 def messages_are_identical(messages1: List[Dict], messages2: List[Dict]) -> bool:
     """Compare two message lists to see if they're identical."""
@@ -1085,13 +1402,38 @@ def messages_are_identical(messages1: List[Dict], messages2: List[Dict]) -> bool
             return False
     return True
 
+def conversation_fingerprint(messages: List[Dict]) -> str:
+    """Digest of the roles and contents of a message list (what messages_are_identical compares)."""
+    payload = json.dumps(
+        [(msg.get("role"), msg.get("content")) for msg in messages],
+        separators=(",", ":")
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def entry_fingerprint(conversation_entry: Dict[str, Any]) -> str:
+    """Fingerprint of a saved conversation (computed once for entries saved without one)."""
+    fingerprint = conversation_entry.get("fingerprint")
+    if fingerprint is None:
+        fingerprint = conversation_fingerprint(conversation_entry.get("messages", []))
+        conversation_entry["fingerprint"] = fingerprint
+    return fingerprint
+
+def entry_id(conversation_entry: Dict[str, Any]) -> int:
+    """Stable id of a saved conversation (assigned once, on save or first render)."""
+    conversation_id = conversation_entry.get("id")
+    if conversation_id is None:
+        conversation_id = st.session_state.history_next_id
+        st.session_state.history_next_id += 1
+        conversation_entry["id"] = conversation_id
+    return conversation_id
+
 def conversation_already_in_history(messages: List[Dict]) -> bool:
     """Check if a conversation with these exact messages already exists in history."""
-    for saved_entry in st.session_state.chat_history:
-        saved_messages = saved_entry.get("messages", [])
-        if messages_are_identical(messages, saved_messages):
-            return True
-    return False
+    fingerprint = conversation_fingerprint(messages)
+    return any(
+        entry_fingerprint(saved_entry) == fingerprint
+        for saved_entry in st.session_state.chat_history
+    )
 
 def restore_conversation(conversation_entry: Dict[str, Any]):
     """Restore a conversation from history."""
@@ -1107,8 +1449,7 @@ def restore_conversation(conversation_entry: Dict[str, Any]):
     # 3. It's not already in history
     if not is_same_conversation and current_messages:
         # Check if there are any user messages (not just assistant welcome message)
-        user_messages = [msg for msg in current_messages if msg.get("role") == "user"]
-        if len(user_messages) > 0:
+        if any(msg.get("role") == "user" for msg in current_messages):
             # Check if current conversation is already in history (avoid duplicates)
             if not conversation_already_in_history(current_messages):
                 save_current_conversation_to_history()
@@ -1116,6 +1457,9 @@ def restore_conversation(conversation_entry: Dict[str, Any]):
     # Restore messages
     st.session_state.messages = target_messages.copy()
     
+    # Personas are looked up again for the restored candidate
+    st.session_state.persona_cache = {}
+    
     # Reset session start time when restoring a conversation (new session starts)
     st.session_state.session_start_time = datetime.now()
     
@@ -1137,19 +1481,21 @@ def restore_conversation(conversation_entry: Dict[str, Any]):
         # Try to extract candidate from messages if state not available (backward compatibility)
         st.session_state.selected_candidate = None
         if not saved_state:
-            # Try to find candidate name in messages
-            for msg in st.session_state.messages:
-                content = msg.get("content", "")
-                try:
-                    candidates = data_client.list_candidates()
-                    for candidate in candidates:
-                        if candidate.name in content or f"**{candidate.name}**" in content:
-                            st.session_state.selected_candidate = candidate
+            # Try to find candidate name in messages: one pattern scan per message,
+            # then the first listed candidate named in the first message that has one
+            try:
+                name_pattern = get_candidate_name_pattern()
+                if name_pattern:
+                    for msg in st.session_state.messages:
+                        content = msg.get("content", "")
+                        if name_pattern.search(content):
+                            for candidate in get_candidates():
+                                if candidate.name in content:
+                                    st.session_state.selected_candidate = candidate
+                                    break
                             break
-                    if st.session_state.selected_candidate:
-                        break
-                except Exception:
-                    pass
+            except Exception:
+                pass
     
     # Restore meeting config
     saved_meeting_config = saved_state.get("meeting_config", {}) if saved_state else {}
@@ -1172,6 +1518,124 @@ def restore_conversation(conversation_entry: Dict[str, Any]):
     st.session_state.awaiting_confirmation = False
     st.session_state.pending_proposal_index = None
 
+def load_more_history():
+    """Extend the rendered history window by one page."""
+    st.session_state.history_visible += HISTORY_PAGE_SIZE
+
+def clear_history():
+    """Delete every saved conversation."""
+    st.session_state.chat_history = []
+
+@st.fragment
+def render_conversation_history():
+    """Render the saved-conversation list in the sidebar.
+    
+    Runs as a fragment so its own widgets (order, details toggles, "Load more")
+    rerun only this list instead of the whole chat page.
+    """
+    if st.session_state.chat_history:
+        st.divider()
+        
+        # Display order toggle
+        display_order = st.radio(
+            "Order",
+            ["Newest First", "Oldest First"],
+            horizontal=True,
+            key="history_order",
+            label_visibility="collapsed"
+        )
+        
+        # Fingerprint the active conversation once for the "current" checks below
+        current_fingerprint = conversation_fingerprint(st.session_state.messages)
+        
+        # One stylesheet for every conversation card in this render
+        st.markdown(HISTORY_CARD_CSS, unsafe_allow_html=True)
+        
+        # Only the first page(s) of history are rendered; "Load more" extends the window.
+        # Slice the window before reversing so only visible entries are copied.
+        chat_history = st.session_state.chat_history
+        visible_count = st.session_state.history_visible
+        if display_order == "Newest First":
+            visible_entries = chat_history[-visible_count:][::-1]
+        else:
+            visible_entries = chat_history[:visible_count]
+        
+        # Scrollable container for history
+        for idx, conversation_entry in enumerate(visible_entries):
+            # Each entry is a dict with 'title', 'summary', and 'messages'
+            title = conversation_entry.get("title", f"Conversation {idx + 1}")
+            summary = conversation_entry.get("summary", "")
+            messages = conversation_entry.get("messages", [])
+            
+            # Generate summary if not available (backward compatibility for old conversations),
+            # storing it on the entry so later reruns don't regenerate it
+            if not summary and messages:
+                saved_state = conversation_entry.get("state", {})
+                meeting_config = saved_state.get("meeting_config", {}) if saved_state else {}
+                summary = generate_conversation_summary(messages, meeting_config)
+                conversation_entry["summary"] = summary
+            
+            # Check if this is the current active conversation
+            fingerprint = entry_fingerprint(conversation_entry)
+            is_current_conversation = fingerprint == current_fingerprint
+            
+            # Key widgets by the entry's id so their state survives new saves and reordering
+            conversation_key = f"continue_{entry_id(conversation_entry)}"
+            
+            # Highlight the current conversation
+            card_class = "conv-card-current" if is_current_conversation else "conv-card-other"
+            
+            # Create clickable card using a button styled as a card
+            # Format button content with title and summary
+            button_text = f"💬 {title}\n\n{summary if summary else 'No summary available'}"
+            
+            # Use a container to wrap the button and apply styling
+            with st.container():
+                # Card classes are styled by HISTORY_CARD_CSS
+                st.markdown(f'<div class="conv-card {card_class}">', unsafe_allow_html=True)
+                
+                # Create the clickable button (entire card area is clickable)
+                if st.button(button_text, key=conversation_key, help=f"Click to continue: {title}", use_container_width=True):
+                    restore_conversation(conversation_entry)
+                    # Restoring changes the chat area too, so rerun the whole app
+                    st.rerun()
+                
+                st.markdown("</div>", unsafe_allow_html=True)
+            
+            # Details are only built for conversations the user opened
+            # (an expander would still create every message widget on each rerun)
+            if st.toggle("View details", key=f"details_{conversation_key}", value=False):
+                if messages:
+                    last_index = len(messages) - 1
+                    for msg_index, msg in enumerate(messages):
+                        role = msg.get("role", "user")
+                        content = msg.get("content", "")
+                        speaker = "**👤 You:**" if role == "user" else "**🤖 Assistant:**"
+                        
+                        # Speaker label and content in one markdown element
+                        st.markdown(f"{speaker}\n\n{content}")
+                        
+                        if msg_index < last_index:
+                            st.divider()
+                else:
+                    st.markdown("*No messages*")
+            
+            if idx < len(visible_entries) - 1:
+                st.divider()
+        
+        hidden_count = len(chat_history) - len(visible_entries)
+        if hidden_count > 0:
+            # Callbacks update state before the fragment reruns, so no explicit rerun is needed
+            st.button(f"Load more ({hidden_count} remaining)", key="history_load_more", use_container_width=True, on_click=load_more_history)
+        
+        st.divider()
+        st.caption(f"Total conversations: {len(st.session_state.chat_history)}")
+        
+        # Clear history button
+        st.button("🗑️ Clear All History", key="clear_history", help="Permanently delete all conversation history", on_click=clear_history)
+    else:
+        st.info("No conversation history yet. Your conversations will be saved here after you reset.")
+
 # ============================================================================
 # MAIN CHAT INTERFACE
 # ============================================================================
@@ -1184,118 +1648,10 @@ with st.sidebar:
     show_history = st.checkbox("Show History", value=True, key="show_history")
     
     if show_history:
-        if st.session_state.chat_history:
-            st.markdown("---")
-            
-            # Display order toggle
-            display_order = st.radio(
-                "Order",
-                ["Newest First", "Oldest First"],
-                horizontal=True,
-                key="history_order",
-                label_visibility="collapsed"
-            )
-            
-            # Prepare messages for display
-            messages_to_display = list(reversed(st.session_state.chat_history)) if display_order == "Newest First" else st.session_state.chat_history
-            
-            # Scrollable container for history
-            for idx, conversation_entry in enumerate(messages_to_display):
-                # Each entry is a dict with 'title', 'summary', and 'messages'
-                title = conversation_entry.get("title", f"Conversation {idx + 1}")
-                summary = conversation_entry.get("summary", "")
-                messages = conversation_entry.get("messages", [])
-                
-                # Generate summary if not available (backward compatibility for old conversations)
-                if not summary and messages:
-                    saved_state = conversation_entry.get("state", {})
-                    meeting_config = saved_state.get("meeting_config", {}) if saved_state else {}
-                    summary = generate_conversation_summary(messages, meeting_config)
-                
-                # Check if this is the current active conversation
-                is_current_conversation = messages_are_identical(st.session_state.messages, messages)
-                
-                # Create a unique key for each conversation button using title hash
-                title_hash = hashlib.md5(title.encode()).hexdigest()[:8]
-                conversation_key = f"continue_{title_hash}_{idx}"
-                
-                # Determine styling based on whether it's the current conversation
-                if is_current_conversation:
-                    # Highlight current conversation
-                    border_style = "2px solid #1f77b4"
-                    bg_style = "rgba(31, 119, 180, 0.15)"
-                else:
-                    border_style = "1px solid rgba(255, 255, 255, 0.1)"
-                    bg_style = "rgba(255, 255, 255, 0.02)"
-                
-                # Create clickable card using a button styled as a card
-                # Format button content with title and summary
-                button_text = f"💬 {title}\n\n{summary if summary else 'No summary available'}"
-                
-                # Use a container to wrap the button and apply styling
-                with st.container():
-                    # Add CSS for this specific conversation item
-                    # Use a unique class name based on the key
-                    st.markdown(f"""
-                    <style>
-                    .conv-btn-{conversation_key} button {{
-                        width: 100% !important;
-                        text-align: left !important;
-                        padding: 12px !important;
-                        border: {border_style} !important;
-                        background-color: {bg_style} !important;
-                        border-radius: 8px !important;
-                        white-space: pre-wrap !important;
-                        font-weight: normal !important;
-                        height: auto !important;
-                        min-height: 60px !important;
-                        margin: 8px 0 !important;
-                    }}
-                    </style>
-                    <div class="conv-btn-{conversation_key}">
-                    """, unsafe_allow_html=True)
-                    
-                    # Create the clickable button (entire card area is clickable)
-                    if st.button(button_text, key=conversation_key, help=f"Click to continue: {title}", use_container_width=True):
-                        restore_conversation(conversation_entry)
-                        st.rerun()
-                    
-                    st.markdown("</div>", unsafe_allow_html=True)
-                
-                # Add expander for details
-                with st.expander("View details", expanded=False):
-                    if messages:
-                        for msg in messages:
-                            role = msg.get("role", "user")
-                            content = msg.get("content", "")
-                            
-                            if role == "user":
-                                st.markdown(f"**👤 You:**")
-                            else:
-                                st.markdown(f"**🤖 Assistant:**")
-                            
-                            st.markdown(content)
-                            
-                            if msg != messages[-1]:
-                                st.markdown("---")
-                    else:
-                        st.markdown("*No messages*")
-                
-                if idx < len(messages_to_display) - 1:
-                    st.markdown("---")
-            
-            st.markdown("---")
-            st.caption(f"Total conversations: {len(st.session_state.chat_history)}")
-            
-            # Clear history button
-            if st.button("🗑️ Clear All History", key="clear_history", help="Permanently delete all conversation history"):
-                st.session_state.chat_history = []
-                st.rerun()
-        else:
-            st.info("No conversation history yet. Your conversations will be saved here after you reset.")
+        render_conversation_history()
         
         # Current session info
-        st.markdown("---")
+        st.divider()
         st.subheader("📊 Current Session")
         if st.session_state.selected_candidate:
             candidate = st.session_state.selected_candidate
@@ -1312,10 +1668,8 @@ with st.sidebar:
         session_start = st.session_state.get("session_start_time")
         if session_start:
             elapsed = datetime.now() - session_start
-            total_seconds = int(elapsed.total_seconds())
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
+            hours, remainder = divmod(int(elapsed.total_seconds()), 3600)
+            minutes, seconds = divmod(remainder, 60)
             
             # Format duration with minutes and seconds (always show seconds)
             if hours > 0:
@@ -1357,19 +1711,12 @@ if st.button("🔄 Reset Conversation", key="reset_button"):
     st.session_state.meeting_request = None
     st.session_state.awaiting_confirmation = False
     st.session_state.messages = []
+    st.session_state.persona_cache = {}
     # Reset session start time for new session
     st.session_state.session_start_time = datetime.now()
     st.rerun()
 
-# Display chat history
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        content = message.get("content", "")
-        if not isinstance(content, str):
-            content = str(content)
-        st.markdown(content)
-
-# Welcome message
+# Welcome message (rendered by the chat history loop below)
 if not st.session_state.messages:
     welcome = """👋 Hi! I'm here to help you schedule onboarding meetings for new hires.
 
@@ -1381,17 +1728,20 @@ Just chat with me naturally! For example:
 
 **What would you like to do?**"""
     
-    st.session_state.messages.append({"role": "assistant", "content": welcome})
-    with st.chat_message("assistant"):
-        st.markdown(welcome)
+    st.session_state.messages.append(make_message("assistant", welcome))
+
+# Display chat history
+# (content is normalized to str by make_message when the message is stored)
+for message in st.session_state.messages:
+    with st.chat_message(message["role"]):
+        st.markdown(message.get("content", ""))
 
 # Handle auto-generate flag
 if st.session_state.get("auto_generate"):
     st.session_state.auto_generate = False
     with st.spinner("Finding available times..."):
-        result = handle_generate_proposals()
-        response_text = result[0] if isinstance(result, tuple) else str(result) if result else ""
-        st.session_state.messages.append({"role": "assistant", "content": response_text})
+        response_text = handle_generate_proposals() or ""
+        st.session_state.messages.append(make_message("assistant", response_text))
         with st.chat_message("assistant"):
             st.markdown(response_text)
 
@@ -1400,7 +1750,7 @@ prompt = st.chat_input("Type your message here...")
 
 if prompt:
     # Add user message
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    st.session_state.messages.append(make_message("user", prompt))
     with st.chat_message("user"):
         st.markdown(prompt)
     
@@ -1411,24 +1761,26 @@ if prompt:
         "duration": st.session_state.meeting_config.get("duration"),
         "has_proposals": bool(st.session_state.proposals),
         "awaiting_confirmation": st.session_state.awaiting_confirmation,
-        "recent_messages": st.session_state.messages[-10:]
+        # Shared, not copied: only the LLM path reads (and slices) it
+        "recent_messages": st.session_state.messages
     }
     
     # Handle pronouns (his, her, their) - check recent messages for candidate name
     prompt_lower = prompt.lower()
-    if any(pronoun in prompt_lower for pronoun in ["his", "her", "their", "him", "she", "they"]):
-        # Look for candidate name in recent messages
-        for msg in reversed(st.session_state.messages[-5:]):
+    mentions_pronoun = _PRONOUN_RE.search(prompt_lower) is not None
+    name_pattern = get_candidate_name_pattern() if mentions_pronoun and not context.get("selected_candidate_name") else None
+    if name_pattern:
+        # Look for candidate name in the most recent assistant message that mentions one
+        for msg in islice(reversed(st.session_state.messages), 5):
             if msg.get("role") == "assistant":
                 content = msg.get("content", "")
-                # Try to extract candidate name from recent assistant messages
-                candidates = data_client.list_candidates()
-                for candidate in candidates:
-                    if candidate.name in content or f"**{candidate.name}**" in content:
-                        # Found a candidate mentioned recently, use it as context
-                        if not context.get("selected_candidate_name"):
+                if name_pattern.search(content):
+                    # Found a candidate mentioned recently (first in list order), use it as context
+                    for candidate in get_candidates():
+                        if candidate.name in content:
                             context["selected_candidate_name"] = candidate.name
-                        break
+                            break
+                    break
     
     # Parse with AI
     ai_intent = parse_intent_with_openai(prompt, context)
@@ -1437,7 +1789,7 @@ if prompt:
     extracted_info = auto_extract_all_info(prompt)
     
     # If pronoun detected and we have context, use it
-    if any(pronoun in prompt_lower for pronoun in ["his", "her", "their", "him", "she", "they"]) and context.get("selected_candidate_name"):
+    if mentions_pronoun and context.get("selected_candidate_name"):
         if not extracted_info.get("candidate_name"):
             extracted_info["candidate_name"] = context["selected_candidate_name"]
     
@@ -1453,12 +1805,9 @@ if prompt:
     # Determine intent
     intent = ai_intent.get("intent") if ai_intent and ai_intent.get("confidence", 0) > 0.5 else None
     
-    # Define pattern lists for priority checks
-    prompt_lower = prompt.lower()
-    
     # Check for option selection - must happen before other intent processing
     if st.session_state.get("proposals"):
-        option_match = re.search(r'option\s*(\d+)', prompt_lower)
+        option_match = _OPTION_RE.search(prompt_lower)
         if option_match:
             option_num = int(option_match.group(1))
             proposal_index = option_num - 1
@@ -1473,43 +1822,39 @@ if prompt:
     # Check for hiring manager info queries
     has_hiring_manager_keywords = (
         "hiring manager" in prompt_lower and 
-        any(word in prompt_lower for word in ["info", "available", "whose", "who has"])
-    ) or any(phrase in prompt_lower for phrase in [
-        "whose hiring manager", "who has hiring manager", "hiring manager info",
-        "hiring manager available", "which candidates have hiring manager",
-        "candidates with hiring manager", "hiring manager information"
-    ])
+        any(word in prompt_lower for word in _HM_QUERY_WORDS)
+    ) or any(phrase in prompt_lower for phrase in _HM_QUERY_PHRASES)
     
     if has_hiring_manager_keywords:
         intent = "list_candidates_with_hiring_managers"
     
     # Fallback intent detection
     if not intent:
-        if any(phrase in prompt_lower for phrase in ["whose recruiter", "who has recruiter", "recruiter info available"]):
+        if any(phrase in prompt_lower for phrase in _RECRUITER_QUERY_PHRASES):
             intent = "list_candidates_with_recruiters"
-        elif any(phrase in prompt_lower for phrase in ["show more candidates", "show more", "next candidates", "more candidates"]):
+        elif any(phrase in prompt_lower for phrase in _MORE_CANDIDATES_PHRASES):
             intent = "list_candidates"
-        elif any(word in prompt_lower for word in ["list", "show", "see"]) and "candidate" in prompt_lower:
+        elif any(word in prompt_lower for word in _LIST_WORDS) and "candidate" in prompt_lower:
             intent = "list_candidates"
-        elif st.session_state.get("proposals") and any(word in prompt_lower for word in ["yes", "confirm", "book", "send", "good", "perfect", "ok"]):
+        elif st.session_state.get("proposals") and any(word in prompt_lower for word in _CONFIRM_WORDS):
             st.session_state.pending_proposal_index = 0
             st.session_state.awaiting_confirmation = True
             intent = "confirm_booking"
-        elif any(word in prompt_lower for word in ["yes", "confirm", "book", "send", "good", "perfect", "ok"]) and st.session_state.awaiting_confirmation:
+        elif any(word in prompt_lower for word in _CONFIRM_WORDS) and st.session_state.awaiting_confirmation:
             st.session_state.pending_proposal_index = 0
             intent = "confirm_booking"
-        elif any(word in prompt_lower for word in ["find", "available", "times", "proposals", "when", "schedule"]):
+        elif any(word in prompt_lower for word in _FIND_WORDS):
             intent = "generate_proposals"
-        elif any(word in prompt_lower for word in ["email", "view email", "show email", "see email", "sent email"]):
+        elif any(word in prompt_lower for word in _EMAIL_WORDS):
             intent = "view_email"
-        elif any(word in prompt_lower for word in ["recruiter", "recruiters", "who recruited"]) and (extracted_info["candidate_name"] or st.session_state.selected_candidate):
+        elif any(word in prompt_lower for word in _RECRUITER_WORDS) and (extracted_info["candidate_name"] or st.session_state.selected_candidate):
             # If asking about recruiter, inform user it's not available
             intent = "list_candidates_with_recruiters"
-        elif any(word in prompt_lower for word in ["info", "details", "about", "who is", "tell me about"]) and (extracted_info["candidate_name"] or st.session_state.selected_candidate):
+        elif any(word in prompt_lower for word in _DETAIL_WORDS) and (extracted_info["candidate_name"] or st.session_state.selected_candidate):
             intent = "view_candidate_details"
-        elif any(word in prompt_lower for word in ["start over", "reset", "restart", "new"]):
+        elif any(word in prompt_lower for word in _RESET_WORDS):
             intent = "start_over"
-        elif any(word in prompt_lower for word in ["setup", "set up", "configure", "schedule"]) and (extracted_info["meeting_type"] or extracted_info["duration"] or extracted_info["candidate_name"]):
+        elif any(word in prompt_lower for word in _SETUP_WORDS) and (extracted_info["meeting_type"] or extracted_info["duration"] or extracted_info["candidate_name"]):
             # If user says "setup/configure/schedule" with meeting details, it's configure_meeting
             intent = "configure_meeting"
         elif extracted_info["candidate_name"]:
@@ -1522,134 +1867,15 @@ if prompt:
     
     with st.spinner("Thinking..."):
         try:
-            if intent == "list_candidates":
-                # Check if this is a "show more" request
-                is_show_more = any(phrase in prompt_lower for phrase in [
-                    "show more candidates", "show more", "next candidates", 
-                    "more candidates", "continue", "load more"
-                ])
-                
-                # Extract count from AI intent first (most reliable)
-                count = None
-                reset_offset = False
-                
-                if ai_intent and "count" in ai_intent:
-                    count_value = ai_intent.get("count")
-                    if count_value is not None:
-                        try:
-                            count = int(count_value)
-                            reset_offset = True
-                        except (ValueError, TypeError):
-                            count = None
-                
-                # Fallback: Extract from prompt directly
-                if not count or count <= 0:
-                    patterns = [
-                        r'show\s+(?:me\s+)?(\d+)\s*(?:candidates?|people|employees?)?',
-                        r'list\s+(\d+)\s*(?:candidates?|people|employees?)?',
-                        r'(\d+)\s+candidates?',
-                        r'(\d+)\s+people',
-                        r'(\d+)\s+employees?',
-                        r'give\s+me\s+(\d+)',
-                        r'display\s+(\d+)',
-                        r'(\d+)\s*$',
-                    ]
-                    for pattern in patterns:
-                        match = re.search(pattern, prompt_lower)
-                        if match:
-                            try:
-                                count = int(match.group(1))
-                                if count > 0:
-                                    reset_offset = True
-                                    break
-                            except (ValueError, IndexError):
-                                continue
-                
-                if is_show_more and not reset_offset:
-                    response = handle_list_candidates(count=count or 10, reset_offset=False)
-                else:
-                    response = handle_list_candidates(count=count, reset_offset=reset_offset or True)
-            elif intent == "list_candidates_with_recruiters":
-                response = handle_list_candidates_with_recruiters()
-            elif intent == "list_candidates_with_hiring_managers":
-                response = handle_list_candidates_with_hiring_managers()
-            elif intent == "select_candidate":
-                candidate_name = ai_intent.get("candidate_name") if ai_intent else extracted_info["candidate_name"]
-                if not candidate_name:
-                    candidate_name = prompt
-                response = handle_select_candidate(candidate_name, ai_intent)
-            elif intent == "configure_meeting":
-                response = handle_configure_meeting(ai_intent, prompt)
-            elif intent == "generate_proposals":
-                show_all = ai_intent.get("show_all", False) if ai_intent else False
-                response = handle_generate_proposals(show_all=show_all)
-            elif intent == "invalid_option":
-                # Handle invalid option number
-                proposals = st.session_state.get("proposals", [])
-                response = f"❌ Invalid option. Please select an option between 1 and {len(proposals)}."
-            elif intent == "confirm_booking":
-                # Get proposal index from session state (set by option parsing or defaults to 0 for best match)
-                proposal_index = st.session_state.pending_proposal_index
-                if proposal_index is None:
-                    proposal_index = 0  # Default to best match if not specified
-                # Validate proposal index
-                proposals = st.session_state.get("proposals", [])
-                if not proposals:
-                    response = "❌ No proposals available. Please generate proposals first."
-                elif proposal_index < 0 or proposal_index >= len(proposals):
-                    response = f"❌ Invalid option. Please select an option between 1 and {len(proposals)}."
-                else:
-                    response = handle_confirm_booking(proposal_index)
-            elif intent == "view_email":
-                response = handle_view_email()
-            elif intent == "view_candidate_details":
-                candidate_name = ai_intent.get("candidate_name") if ai_intent else extracted_info.get("candidate_name")
-                # Don't pass None as candidate_name - use selected candidate or extract from context
-                if not candidate_name and st.session_state.selected_candidate:
-                    candidate_name = None  # Will use selected candidate
-                elif not candidate_name:
-                    # Try to extract from prompt if it mentions a specific name
-                    prompt_lower = prompt.lower()
-                    candidates = data_client.list_candidates()
-                    for cand in candidates:
-                        if cand.name.lower() in prompt_lower or prompt_lower in cand.name.lower():
-                            candidate_name = cand.name
-                            break
-                response = handle_view_candidate_details(candidate_name)
-            elif intent == "start_over":
-                response = handle_start_over()
-            else:
-                # Smart fallback
-                if st.session_state.awaiting_confirmation:
-                    response = "Not sure what you mean. Say 'yes' to book the meeting, or 'show more' for other times."
-                elif not st.session_state.selected_candidate:
-                    response = "I'm here to help schedule meetings! Try saying 'show candidates' or just type a candidate's name."
-                else:
-                    response = "I'm not quite sure what you'd like to do. "
-                    suggestion = smart_suggest_next_action()
-                    if suggestion:
-                        response += f"\n\n{suggestion}"
+            handler = INTENT_HANDLERS.get(intent, _route_fallback)
+            response = handler(prompt, ai_intent, extracted_info)
         except Exception as e:
             response = f"Oops, something went wrong: {str(e)}\n\nLet's try again!"
     
-    # Display response - extract text from tuple if needed
-    if isinstance(response, tuple) and len(response) == 2:
-        response_text = response[0] if isinstance(response[0], str) else str(response[0])
-    else:
-        response_text = str(response) if response else ""
-    
-    # Clean tuple representation if it leaked into string
-    if response_text.strip().startswith("(") and "proposal_index" in response_text:
-        try:
-            parsed = ast.literal_eval(response_text)
-            if isinstance(parsed, tuple) and len(parsed) == 2:
-                response_text = str(parsed[0]) if parsed[0] else ""
-        except:
-            match = re.search(r"^\(['\"](.+?)(?:',\s*\[|\",\s*\[)", response_text, re.DOTALL)
-            if match:
-                response_text = match.group(1).replace("\\n", "\n")
+    # Handlers and routes return the reply as markdown text
+    response_text = response or ""
     
-    st.session_state.messages.append({"role": "assistant", "content": response_text})
+    st.session_state.messages.append(make_message("assistant", response_text))
     
     with st.chat_message("assistant"):
         st.markdown(response_text)